@@ -1,4 +1,6 @@
-from .circuit_breaker import CircuitBreaker
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .exceptions import AllServicesFailedError, RateLimitExceededError
+from .connection_pool import ConnectionPool
 from .policies import RetryPolicy
 from .manager import FailoverManager
 from .service import Service
@@ -6,8 +8,12 @@ from .api import APIService
 from .rate import RateLimiter  # Corrected import
 
 __all__ = [
-    'BaseService',
+    'Service',
     'CircuitBreaker',
+    'CircuitOpenError',
+    'AllServicesFailedError',
+    'RateLimitExceededError',
+    'ConnectionPool',
     'RetryPolicy',
     'FailoverManager',
     'APIService',
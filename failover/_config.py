@@ -0,0 +1,86 @@
+import configparser
+import logging
+import os
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+CONFIG_FILE = 'config.ini'
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Immutable snapshot of the failover configuration.
+
+    Values are read once from the [DEFAULT] section of config.ini, falling back to an
+    environment variable of the same (upper-case) name and then to the defaults below.
+    Service base URLs are read from the [SERVICES] section.
+    """
+    api_key: str = field(default='your_api_key', repr=False)
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    jitter: float = 0.5
+    failure_threshold: int = 3
+    recovery_time: int = 60
+    default_timeout: int = 5
+    default_retry_after: int = 60
+    max_429_retries: int = 3
+    default_ttl: int = 300
+    default_max_size: int = 10
+    default_cache_size: int = 100
+    max_cache_bytes: int = 262144
+    rate_limit: int = 5
+    rate_limit_period: float = 1.0
+    delay_threshold: float = 1.0
+    timeout: float = 5.0
+    dns_cache_ttl: float = 60.0
+    max_connections: int = 100
+    max_connections_per_host: int = 20
+    max_inflight: int = 20
+    keepalive_timeout: float = 30.0
+    health_ttl: float = 5.0
+    services: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+
+    @classmethod
+    def load(cls, path: str = CONFIG_FILE) -> 'Settings':
+        """
+        Parse the configuration file and environment into a Settings instance.
+
+        :param path: The path of the INI file to read.
+        :return: A frozen Settings instance.
+        """
+        config = configparser.ConfigParser()
+        config.read(path)
+        values = {}
+        for setting in fields(cls):
+            if setting.name == 'services':
+                continue
+            key = setting.name.upper()
+            raw = config.get('DEFAULT', key, fallback=os.environ.get(key))
+            if raw is not None:
+                values[setting.name] = setting.type(raw)
+
+        services = {}
+        if config.has_section('SERVICES'):
+            defaults = config.defaults()
+            for key, value in config.items('SERVICES'):
+                if key not in defaults:
+                    services[key.upper()] = value
+        values['services'] = MappingProxyType(services)
+
+        logger.debug("Settings loaded from %s", path)
+        return cls(**values)
+
+    def service_url(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Return the base URL configured for a service.
+
+        :param name: The configuration key of the service, e.g. SERVICE1_BASE_URL.
+        :param default: The value to return when neither config.ini nor the environment defines it.
+        :return: The configured base URL.
+        """
+        return self.services.get(name, os.environ.get(name, default))
+
+SETTINGS = Settings.load()
@@ -1,145 +1,582 @@
 import aiohttp
 import asyncio
+import json
 import logging
-import configparser
-from typing import Dict, Optional, List
-from datetime import datetime
+import itertools
+import random
+import re
+import sys
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from yarl import URL
+from typing import Any, AsyncIterator, Awaitable, Deque, Dict, Hashable, Optional, List, Tuple
+from datetime import datetime, timezone
+from ._config import SETTINGS
 from .service import Service, HealthStatus
 from .rate import RateLimiter
-from .metrics import MetricsCollector
 from .connection_pool import ConnectionPool
-from .cache import Cache
+from .cache import Cache, request_key
+from .batch import BatchBuffer, DEFAULT_BATCH_SIZE, DEFAULT_MAX_WAIT
+from .exceptions import RateLimitExceededError
 
-# Load configuration from config file
-config = configparser.ConfigParser()
-config.read('config.ini')
+try:
+    import aiodns  # Optional: lets the connector resolve names without a thread pool
+except ImportError:
+    aiodns = None
+
+try:
+    import orjson  # Optional: faster JSON parsing and serialization
+except ImportError:
+    orjson = None
 
 # Constants
-DEFAULT_TIMEOUT = config.getint('DEFAULT', 'DEFAULT_TIMEOUT', fallback=5)  # seconds
-DEFAULT_RETRY_AFTER = config.getint('DEFAULT', 'DEFAULT_RETRY_AFTER', fallback=60)  # seconds
-HTTP_METHODS = ['GET', 'POST', 'PUT', 'DELETE']
+DEFAULT_TIMEOUT = SETTINGS.default_timeout  # seconds
+DEFAULT_RETRY_AFTER = SETTINGS.default_retry_after  # seconds
+MAX_CONNECTIONS = SETTINGS.max_connections
+MAX_CONNECTIONS_PER_HOST = SETTINGS.max_connections_per_host
+MAX_INFLIGHT = SETTINGS.max_inflight
+KEEPALIVE_TIMEOUT = SETTINGS.keepalive_timeout  # seconds
+CONNECTOR_DNS_CACHE_TTL = 300  # seconds a resolved host is reused by the connector
+HEALTH_TTL = SETTINGS.health_ttl  # seconds
+HEALTH_TTL_SMUDGE = 0.25  # fraction of HEALTH_TTL added as random jitter
+MAX_429_RETRIES = SETTINGS.max_429_retries
+BACKOFF_BASE = SETTINGS.base_delay  # seconds
+BACKOFF_JITTER = SETTINGS.jitter  # seconds
+HTTP_METHODS = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
+_INTERNED_METHODS = {method: sys.intern(method) for method in HTTP_METHODS}
+MAX_INTERNED_ENDPOINTS = 1024
+NEGATIVE_CACHE_TTL = 5.0  # seconds a 404 is remembered
+_MAX_AGE = re.compile(r'(?:^|[,\s])max-age\s*=\s*"?(\d+)')
+_NO_STORE_DIRECTIVES = ('no-store', 'no-cache', 'private')
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+def _json_loads(text: str) -> Any:
+    """
+    Parse a JSON document, with orjson when it is installed.
+    
+    :param text: The JSON text.
+    :return: The parsed value.
+    :raises ValueError: If the text is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def _json_dumps(value: Any) -> str:
+    """
+    Serialize a value to JSON text, with orjson when it is installed.
+    
+    :param value: The JSON-serializable value.
+    :return: The JSON text.
+    """
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+class RetryableError(ConnectionError):
+    """
+    Raised when the service asks the client to retry later (HTTP 429).
+
+    Handled by APIService itself; once its retries are used up, RateLimitExceededError is raised instead.
+    """
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        """
+        :param message: The error message.
+        :param retry_after: The delay requested by the server in seconds, if it sent one.
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
 class APIService(Service):
-    def __init__(self, api_key: str, base_url: str):
+    # Methods whose `data` is sent as a JSON body
+    _METHOD_HAS_BODY = frozenset({'POST', 'PUT', 'PATCH'})
+
+    def __init__(self, api_key: str, base_url: str, ttl_dns_cache: Optional[float] = CONNECTOR_DNS_CACHE_TTL,
+                 batch_endpoint: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 batch_max_wait: float = DEFAULT_MAX_WAIT):
         """
         Initialize the APIService with the given API key and base URL.
+
+        With a batch_endpoint, requests carrying a body (POST, PUT, PATCH) that arrive within
+        batch_max_wait seconds of each other are sent together as one POST to that endpoint.
+        Its body is ``{"requests": [{"method", "endpoint", "params", "data"}, ...]}`` and the
+        upstream must answer with a JSON array holding one result per request, in order.
+        String results are returned as they are, other JSON values are returned serialized.
         
         :param api_key: The API key for authentication.
         :param base_url: The base URL of the external API service.
+        :param ttl_dns_cache: Seconds the connector reuses a resolved host, or None to keep it forever.
+        :param batch_endpoint: The endpoint accepting batched requests, or None to send each request alone.
+        :param batch_size: The maximum number of requests in one batch.
+        :param batch_max_wait: The maximum time in seconds a request waits for others to join its batch.
         """
         super().__init__(base_url)
         self.api_key = api_key
-        self.rate_limiter = RateLimiter()
-        self.health_history: List[HealthStatus] = []  # Keep track of health check history
-        logger.info(f"APIService initialized with base_url={base_url}")
+        self.health_history: Deque[HealthStatus] = deque(maxlen=100)  # Keep track of the last 100 health checks
+        # Services calling the same origin share one token bucket
+        base = URL(base_url)
+        self.rate_limiter = RateLimiter.shared(str(base.origin()) if base.is_absolute() else base_url)
+        # Sent unchanged with every request; aiohttp copies them, so they are never mutated
+        self._headers: Dict[str, str] = {
+            'Authorization': f"Bearer {api_key}",
+            'User-Agent': 'ExternalAPIService/1.0'
+        }
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ttl_dns_cache = ttl_dns_cache
+        self._endpoint_keys: Dict[str, str] = {}
+        self._urls: Dict[str, URL] = {}
+        self._health_cache_ttl = HEALTH_TTL
+        self._health_cache_expires = 0.0
+        # Loop time before which no request is sent, set when the service answers 429
+        self._retry_not_before = 0.0
+        self.batch_endpoint = batch_endpoint
+        self._batcher: Optional[BatchBuffer] = None
+        if batch_endpoint is not None:
+            self._batcher = BatchBuffer(self._send_batch, batch_size, batch_max_wait)
+        logger.info("APIService initialized with base_url=%s", base_url)
+
+    def _create_connection_pool(self) -> ConnectionPool:
+        """
+        Create the pool bounding this service's in-flight requests.
+
+        It is sized like the connector's per-host limit, so bursts queue here instead of
+        piling up inside aiohttp waiting for a free connection.
+        
+        :return: An instance of ConnectionPool.
+        """
+        return ConnectionPool(max_size=MAX_INFLIGHT)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared aiohttp session, creating it on first use.
+
+        The session is created lazily so that it is bound to the running event loop,
+        and reused afterwards so keep-alive connections and resolved DNS entries are
+        shared across requests instead of being re-established on every call. When the
+        optional ``aiodns`` package is installed, names are resolved asynchronously
+        instead of through getaddrinfo in the default thread pool.
+
+        :return: The aiohttp ClientSession used for all requests of this service.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=MAX_CONNECTIONS,
+                limit_per_host=MAX_CONNECTIONS_PER_HOST,
+                use_dns_cache=True,
+                ttl_dns_cache=self._ttl_dns_cache,
+                resolver=aiohttp.AsyncResolver() if aiodns is not None else None,
+                keepalive_timeout=KEEPALIVE_TIMEOUT
+            )
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+                connector=connector
+            )
+            logger.debug("Created shared ClientSession for %s", self.base_url)
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Close the shared aiohttp session and release its pooled connections.
+
+        Requests waiting to be batched are sent first.
+        """
+        if self._batcher is not None:
+            await self._batcher.flush()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("Closed ClientSession for %s", self.base_url)
+        self._session = None
 
     async def request(self, endpoint: str, method: str = 'GET', params: Dict = None, data: Dict = None) -> str:
         """
         Make a request to the external API service.
         
         :param endpoint: The API endpoint to request.
-        :param method: The HTTP method to use (GET, POST, PUT, DELETE).
+        :param method: The HTTP method to use (GET, POST, PUT, PATCH, DELETE).
         :param params: The query parameters for the request.
         :param data: The data to send in the request body.
         :return: The response text from the API.
         """
-        logger.debug(f"Requesting {method} {endpoint} with params={params} and data={data}")
-        if method not in HTTP_METHODS:
+        logger.debug("Requesting %s %s with params=%s", method, endpoint, params)
+        if method not in _INTERNED_METHODS:
             raise ValueError(f"Unsupported HTTP method: {method}")
 
-        # Verify service health before making request
-        health_status = await self.health_check()
-        if not health_status.overall_status:
-            logger.error(f"Service {self.base_url} is unhealthy: {health_status.error_message}")
-            raise ConnectionError(f"Service is unhealthy: {health_status.error_message}")
-            
-        cache_key = f"{method}:{endpoint}:{str(params)}:{str(data)}"
-        cached_response = self.cache.get(cache_key)
-        if cached_response:
-            logger.debug(f"Cache hit for key={cache_key}")
-            return cached_response
+        await self._ensure_healthy()
+
+        cache_key = self._cache_key(method, endpoint, params, data)
+        # Concurrent callers asking for the same key share a single upstream request
+        return await self.cache.get_or_compute(
+            cache_key, lambda: self._fetch(endpoint, method, params, data), with_ttl=True
+        )
+
+    async def request_uncached(self, endpoint: str, method: str = 'GET', params: Dict = None,
+                               data: Dict = None) -> Tuple[str, Optional[float]]:
+        """
+        Make a request to the external API service without the service's cache.
+
+        Used when the caller caches responses itself, so they are not cached twice with
+        different lifetimes.
+        
+        :param endpoint: The API endpoint to request.
+        :param method: The HTTP method to use (GET, POST, PUT, PATCH, DELETE).
+        :param params: The query parameters for the request.
+        :param data: The data to send in the request body.
+        :return: The response text from the API and how long it may be cached (see _cache_ttl).
+        """
+        logger.debug("Requesting %s %s uncached with params=%s", method, endpoint, params)
+        if method not in _INTERNED_METHODS:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        await self._ensure_healthy()
+        return await self._fetch(endpoint, method, params, data)
+
+    def _fetch(self, endpoint: str, method: str, params: Optional[Dict],
+               data: Optional[Dict]) -> Awaitable[Tuple[str, Optional[float]]]:
+        """
+        Send a request on its own or, when batching is enabled and it carries a body, in the next batch.
+        
+        :param endpoint: The API endpoint to request.
+        :param method: The HTTP method to use.
+        :param params: The query parameters for the request.
+        :param data: The data to send in the request body.
+        :return: An awaitable producing the response text and how long it may be cached.
+        """
+        if self._batcher is not None and method in self._METHOD_HAS_BODY:
+            return self._batched_request(endpoint, method, params, data)
+        return self._do_request(endpoint, method, params, data)
+
+    async def request_json(self, endpoint: str, method: str = 'GET', params: Dict = None, data: Dict = None) -> Any:
+        """
+        Make a request to the external API service and parse the JSON response.
+
+        The response text is cached exactly as with request(); parsing uses orjson when it is installed.
+        
+        :param endpoint: The API endpoint to request.
+        :param method: The HTTP method to use (GET, POST, PUT, PATCH, DELETE).
+        :param params: The query parameters for the request.
+        :param data: The data to send in the request body.
+        :return: The parsed JSON response.
+        :raises ValueError: If the response is not valid JSON.
+        """
+        return _json_loads(await self.request(endpoint, method, params, data))
+
+    async def _batched_request(self, endpoint: str, method: str, params: Optional[Dict],
+                               data: Optional[Dict]) -> Tuple[str, Optional[float]]:
+        """
+        Send a request as part of the next batch.
+        
+        :param endpoint: The API endpoint to request.
+        :param method: The HTTP method to use.
+        :param params: The query parameters for the request.
+        :param data: The data to send in the request body.
+        :return: The result of the request and how long it may be cached (the cache TTL).
+        """
+        result = await self._batcher.submit({'method': method, 'endpoint': endpoint, 'params': params, 'data': data})
+        return result if isinstance(result, str) else _json_dumps(result), None
+
+    async def _send_batch(self, requests: List[Dict]) -> List[Any]:
+        """
+        Send a batch of requests to the batch endpoint.
+        
+        :param requests: The requests of the batch.
+        :return: One result per request, in order.
+        """
+        text, _ = await self._do_request(self.batch_endpoint, 'POST', None, {'requests': requests})
+        try:
+            results = _json_loads(text)
+        except ValueError as e:
+            raise ConnectionError(f"Invalid batch response: {e}") from e
+        if not isinstance(results, list):
+            raise ConnectionError("Invalid batch response: expected a JSON array")
+        return results
+
+    def _cache_key(self, method: str, endpoint: str, params: Optional[Dict], data: Optional[Dict]) -> Hashable:
+        """
+        Build the cache key of a request.
+
+        Method and endpoint strings are interned so repeated requests reuse the same
+        string objects and their cached hashes. At most MAX_INTERNED_ENDPOINTS endpoints
+        are remembered, so endpoints embedding IDs cannot grow the table without bound.
+        Request bodies are reduced to a digest so cached keys stay small whatever their size.
+        
+        :param method: The HTTP method.
+        :param endpoint: The API endpoint.
+        :param params: The query parameters.
+        :param data: The request body.
+        :return: A hashable key that does not depend on dict ordering.
+        """
+        endpoint_key = self._endpoint_keys.get(endpoint)
+        if endpoint_key is None:
+            endpoint_key = sys.intern(endpoint)
+            if len(self._endpoint_keys) < MAX_INTERNED_ENDPOINTS:
+                self._endpoint_keys[endpoint_key] = endpoint_key
+        return request_key(_INTERNED_METHODS[method], endpoint_key, params, data)
+
+    async def stream(self, endpoint: str, method: str = 'GET', params: Dict = None, data: Dict = None,
+                     chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        """
+        Make a request to the external API service and yield the response body in chunks.
+
+        Use this instead of request() for large payloads: the body is never held in memory
+        as a whole and is not cached.
+        
+        :param endpoint: The API endpoint to request.
+        :param method: The HTTP method to use (GET, POST, PUT, PATCH, DELETE).
+        :param params: The query parameters for the request.
+        :param data: The data to send in the request body.
+        :param chunk_size: The maximum size of each yielded chunk in bytes.
+        :return: An async iterator over the response body.
+        """
+        logger.debug("Streaming %s %s with params=%s", method, endpoint, params)
+        if method not in _INTERNED_METHODS:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        await self._ensure_healthy()
+        await self._wait_retry_deadline()
 
         async with self.connection_pool:
-            with self.metrics.latency_histogram.labels(
-                service=self.__class__.__name__,
-                endpoint=endpoint
-            ).time():
-                url = f"{self.base_url}{endpoint}"
-                headers = {
-                    'Authorization': f"Bearer {self.api_key}",
-                    'User-Agent': 'ExternalAPIService/1.0'
-                }
-                
+            async with self.rate_limiter:
+                try:
+                    async with self._get_session().request(
+                        method, self._build_url(endpoint), headers=self._headers,
+                        params=params, json=data if method in self._METHOD_HAS_BODY else None
+                    ) as response:
+                        response.raise_for_status()
+                        async for chunk in response.content.iter_chunked(chunk_size):
+                            yield chunk
+                except asyncio.TimeoutError:
+                    # The cached health result can no longer be trusted
+                    self._health_cache_expires = 0.0
+                    self.metrics.record_error("timeout", f"Request to {endpoint} timed out")
+                    logger.error("Request to %s timed out", endpoint)
+                    raise ConnectionError("Request timed out")
+                except aiohttp.ClientError as e:
+                    if not isinstance(e, aiohttp.ClientResponseError):
+                        self._health_cache_expires = 0.0
+                    self.metrics.record_error("client_error", str(e))
+                    logger.error("Client error during request to %s: %s", endpoint, e)
+                    raise ConnectionError(f"Client error: {e}")
+
+    async def _ensure_healthy(self) -> None:
+        """
+        Verify service health before making a request, reusing a recent healthy result.
+
+        A healthy result is reused until its expiry, which is the TTL plus up to
+        HEALTH_TTL_SMUDGE of it in random jitter so services sharing a TTL do not
+        all re-check on the same request.
+
+        :raises ConnectionError: If the service is unhealthy.
+        """
+        now = time.monotonic()
+        last_status = self._last_health_status
+        if not (last_status and last_status.overall_status and now < self._health_cache_expires):
+            health_status = await self.health_check()
+            self._renew_health_cache(now)
+            if not health_status.overall_status:
+                logger.error("Service %s is unhealthy: %s", self.base_url, health_status.error_message)
+                raise ConnectionError(f"Service is unhealthy: {health_status.error_message}")
+
+    def _renew_health_cache(self, now: float) -> None:
+        """
+        Reuse the health check just made until its TTL, smudged by up to HEALTH_TTL_SMUDGE, elapses.
+
+        :param now: The time.monotonic() value at which the check started.
+        """
+        ttl = self._health_cache_ttl
+        self._health_cache_expires = now + ttl + random.random() * ttl * HEALTH_TTL_SMUDGE
+
+    async def _do_request(self, endpoint: str, method: str, params: Optional[Dict],
+                          data: Optional[Dict]) -> Tuple[str, Optional[float]]:
+        """
+        Perform the HTTP request against the external API service, bypassing the cache.
+        
+        :param endpoint: The API endpoint to request.
+        :param method: The HTTP method to use.
+        :param params: The query parameters for the request.
+        :param data: The data to send in the request body.
+        :return: The response text from the API and how long it may be cached (see _cache_ttl).
+        :raises RateLimitExceededError: If the service still answers 429 after MAX_429_RETRIES retries.
+        """
+        url = self._build_url(endpoint)
+        body = data if method in self._METHOD_HAS_BODY else None
+        attempt = 0
+        while True:
+            try:
+                return await self._send(endpoint, method, url, params, body)
+            except RetryableError as e:
+                if attempt >= MAX_429_RETRIES:
+                    raise RateLimitExceededError(str(e), e.retry_after) from e
+                delay = self._backoff_delay(attempt, e.retry_after)
+                attempt += 1
+                # Every request of the service, not only this one, holds off until the deadline;
+                # _send waits for it
+                loop_time = asyncio.get_running_loop().time()
+                self._retry_not_before = max(self._retry_not_before, loop_time + delay)
+                logger.warning("Rate limited. Retrying after %.2f seconds.", self._retry_not_before - loop_time)
+
+    async def _wait_retry_deadline(self) -> None:
+        """
+        Wait until the deadline set by the last 429 answer has passed.
+
+        Each waiter adds its own random delay of up to BACKOFF_JITTER seconds, so the requests
+        held back by one deadline are spread out instead of all being sent at the same instant.
+        """
+        loop = asyncio.get_running_loop()
+        wait = self._retry_not_before - loop.time()
+        while wait > 0:
+            await asyncio.sleep(wait + random.random() * BACKOFF_JITTER)
+            # The deadline moves if the service answered 429 again meanwhile
+            wait = self._retry_not_before - loop.time()
+
+    async def _send(self, endpoint: str, method: str, url: URL, params: Optional[Dict],
+                    body: Optional[Dict]) -> Tuple[str, Optional[float]]:
+        """
+        Send a single HTTP request, holding a pool slot and a rate limiter token.
+        
+        :param endpoint: The API endpoint, used for metrics and logs.
+        :param method: The HTTP method to use.
+        :param url: The full URL to request.
+        :param params: The query parameters for the request.
+        :param body: The JSON body to send, or None.
+        :return: The response text from the API and how long it may be cached (see _cache_ttl).
+        :raises RetryableError: If the service answered 429.
+        """
+        # Waited for before taking a pool slot and a token, so a backoff holds neither
+        await self._wait_retry_deadline()
+        async with self.connection_pool:
+            with self.metrics.labelled('latency_histogram', self.__class__.__name__, endpoint).time():
                 async with self.rate_limiter:
+                    # Headers are not logged: they carry the API key
+                    logger.debug("Making %s request to %s params=%s", method, url, params)
                     try:
-                        timeout = aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
-                        async with aiohttp.ClientSession(timeout=timeout) as session:
-                            response = await self._make_request(session, method, url, headers, params, data)
-                            result = await self._handle_response(response, endpoint)
-                            
-                        self.cache.set(cache_key, result)
-                        return result
-                        
+                        # The context manager returns the connection to the pool in every case
+                        async with self._get_session().request(method, url, headers=self._headers, params=params, json=body) as response:
+                            return await self._handle_response(response, endpoint)
                     except asyncio.TimeoutError:
+                        # The cached health result can no longer be trusted
+                        self._health_cache_expires = 0.0
                         self.metrics.record_error("timeout", f"Request to {endpoint} timed out")
-                        logger.error(f"Request to {endpoint} timed out")
+                        logger.error("Request to %s timed out", endpoint)
                         raise ConnectionError("Request timed out")
                     except aiohttp.ClientError as e:
+                        if not isinstance(e, aiohttp.ClientResponseError):
+                            self._health_cache_expires = 0.0
                         self.metrics.record_error("client_error", str(e))
-                        logger.error(f"Client error during request to {endpoint}: {e}")
-                        raise ConnectionError(f"Client error: {e}")
+                        logger.error("Client error during request to %s: %s", endpoint, e)
+                        error = ConnectionError(f"Client error: {e}")
+                        if isinstance(e, aiohttp.ClientResponseError) and e.status == 404:
+                            # Absorb bursts of requests for a missing resource
+                            error.cache_ttl = NEGATIVE_CACHE_TTL
+                        raise error
 
-    async def _make_request(self, session: aiohttp.ClientSession, method: str, 
-                          url: str, headers: Dict, params: Optional[Dict], 
-                          data: Optional[Dict]) -> aiohttp.ClientResponse:
+    @staticmethod
+    def _backoff_delay(attempt: int, retry_after: Optional[float]) -> float:
         """
-        Make an HTTP request using the aiohttp session.
+        Compute how long to wait before retrying a rate-limited request.
+
+        The server's Retry-After is honoured when present, otherwise the delay grows
+        exponentially up to DEFAULT_RETRY_AFTER. Jitter is added by each waiter (see
+        _wait_retry_deadline), not here, so it is not lost when callers share a deadline.
         
-        :param session: The aiohttp ClientSession to use.
-        :param method: The HTTP method to use.
-        :param url: The full URL to request.
-        :param headers: The headers to include in the request.
-        :param params: The query parameters for the request.
-        :param data: The data to send in the request body.
-        :return: The aiohttp ClientResponse object.
-        """
-        logger.debug(f"Making {method} request to {url} with headers={headers} and params={params}")
-        if method == 'GET':
-            return await session.get(url, headers=headers, params=params)
-        elif method == 'POST':
-            return await session.post(url, headers=headers, json=data)
-        elif method == 'PUT':
-            return await session.put(url, headers=headers, json=data)
-        elif method == 'DELETE':
-            return await session.delete(url, headers=headers)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
+        :param attempt: The number of retries already made.
+        :param retry_after: The delay requested by the server, if any.
+        :return: The delay in seconds.
+        """
+        if retry_after is None:
+            retry_after = min(DEFAULT_RETRY_AFTER, BACKOFF_BASE * (2 ** attempt))
+        return retry_after
+
+    def _build_url(self, endpoint: str) -> URL:
+        """
+        Append the endpoint to the base URL and parse the result.
+
+        The endpoint is appended as a string, exactly as the URL used to be built, and parsed
+        the way aiohttp parses a string URL, so existing percent-escapes, a query string on the
+        base URL and trailing slashes are kept as they are. URLs are immutable, so the URLs of
+        up to MAX_INTERNED_ENDPOINTS endpoints are remembered and reused instead of being
+        parsed again.
+
+        :param endpoint: The API endpoint, optionally with a query string.
+        :return: The full URL to request.
+        """
+        url = self._urls.get(endpoint)
+        if url is not None:
+            return url
+        url = URL(f"{self.base_url}{endpoint}")
+        if len(self._urls) < MAX_INTERNED_ENDPOINTS:
+            self._urls[endpoint] = url
+        return url
 
-    async def _handle_response(self, response: aiohttp.ClientResponse, endpoint: str) -> str:
+    @staticmethod
+    def _get_retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+        """
+        Read the delay requested by a 429 response.
+        
+        :param response: The aiohttp ClientResponse object.
+        :return: The number of seconds to wait, or None if the header is missing or not numeric.
+        """
+        try:
+            return min(DEFAULT_RETRY_AFTER, max(0.0, float(response.headers['Retry-After'])))
+        except (KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def _cache_ttl(response: aiohttp.ClientResponse) -> Optional[float]:
+        """
+        Work out how long a response may be cached from its Cache-Control, Age and Expires headers.
+        
+        :param response: The aiohttp ClientResponse object.
+        :return: The freshness lifetime in seconds, 0 if the response must not be cached,
+            or None if the response does not say (the cache default then applies).
+        """
+        headers = response.headers
+        cache_control = headers.get('Cache-Control')
+        if cache_control:
+            directives = cache_control.lower()
+            if any(directive in directives for directive in _NO_STORE_DIRECTIVES):
+                return 0.0
+            match = _MAX_AGE.search(directives)
+            if match:
+                try:
+                    age = float(headers.get('Age', 0))
+                except ValueError:
+                    age = 0.0
+                return max(0.0, int(match.group(1)) - age)
+        expires = headers.get('Expires')
+        if expires:
+            try:
+                expires_at = parsedate_to_datetime(expires)
+            except (TypeError, ValueError):
+                # An invalid Expires date means the response is already stale
+                return 0.0
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            return max(0.0, (expires_at - datetime.now(timezone.utc)).total_seconds())
+        return None
+
+    async def _handle_response(self, response: aiohttp.ClientResponse, endpoint: str) -> Tuple[str, Optional[float]]:
         """
         Handle the HTTP response from the API request.
         
         :param response: The aiohttp ClientResponse object.
         :param endpoint: The API endpoint that was requested.
-        :return: The response text from the API.
+        :return: The response text from the API and how long it may be cached (see _cache_ttl).
         """
-        logger.debug(f"Handling response for {endpoint} with status {response.status}")
+        logger.debug("Handling response for %s with status %s", endpoint, response.status)
         if response.status == 429:
-            retry_after = int(response.headers.get('Retry-After', DEFAULT_RETRY_AFTER))
-            logger.warning(f"Rate limited. Retrying after {retry_after} seconds.")
+            retry_after = self._get_retry_after(response)
+            response.release()
             self.metrics.record_error("rate_limit", f"Rate limited on {endpoint}")
-            await asyncio.sleep(retry_after)
-            return await self.request(endpoint)
-        
+            raise RetryableError(f"Rate limited on {endpoint}", retry_after=retry_after)
+
         try:
             response.raise_for_status()
-            return await response.text()
+            return await response.text(), self._cache_ttl(response)
         except aiohttp.ClientResponseError as e:
             self.metrics.record_error("response_error", f"{e.status}: {e.message}")
-            logger.error(f"Response error for {endpoint}: {e.status} {e.message}")
+            logger.error("Response error for %s: %s %s", endpoint, e.status, e.message)
             raise
 
     def get_health_history(self) -> List[Dict]:
@@ -149,23 +586,45 @@ class APIService(Service):
         :return: A list of dictionaries representing the health check history.
         """
         logger.debug("Getting health history")
-        return [status.to_dict() for status in self.health_history[-10:]]  # Keep last 10 checks
+        recent = list(itertools.islice(reversed(self.health_history), 10))  # Keep last 10 checks
+        return [status.to_dict() for status in reversed(recent)]
 
-    async def verify_service_health(self, display_results: bool = True) -> bool:
+    async def verify_service_health(self, display_results: bool = True, max_age: Optional[float] = None) -> bool:
         """
         Verify the health of the service and maintain health history.
         
         :param display_results: Whether to display the health check results.
+        :param max_age: If set, reuse the last status instead of checking again when it was healthy
+            and is younger than this many seconds (see Service.health_check).
         :return: True if the service is healthy, False otherwise.
         """
-        logger.info(f"Verifying health for service {self.base_url}")
-        health_status = await self.health_check()
+        logger.info("Verifying health for service %s", self.base_url)
+        started = time.monotonic()
+        last_status = self._last_health_status
+        health_status = await self.health_check(max_age=max_age)
+        if health_status is last_status:
+            # Nothing was checked, so there is nothing new to record
+            logger.debug("Reusing the health status of %s", self.base_url)
+        else:
+            self._record_health_status(health_status, started)
+
+        if display_results:
+            print(f"\nService: {self.base_url}")
+            print(health_status.format_report())
+            
+        return health_status.overall_status
+
+    def _record_health_status(self, health_status: HealthStatus, started: float) -> None:
+        """
+        Record a new health check in the health cache, the health history and the metrics.
+
+        :param health_status: The result of the check.
+        :param started: The time.monotonic() value at which the check started.
+        """
+        # Requests reuse this result instead of checking again
+        self._renew_health_cache(started)
         self.health_history.append(health_status)
-        
-        # Trim history if it gets too long
-        if len(self.health_history) > 100:
-            self.health_history = self.health_history[-100:]
-        
+
         # Update metrics with service name
         service_name = self.__class__.__name__
         self.metrics.record_health_check(
@@ -179,7 +638,7 @@ class APIService(Service):
                 message=health_status.error_message,
                 service_name=service_name
             )
-            logger.error(f"Health check failed for {self.base_url}: {health_status.error_message}")
+            logger.error("Health check failed for %s: %s", self.base_url, health_status.error_message)
         
         # Record DNS and ping latencies if available
         if health_status.dns_check["duration"] > 0:
@@ -193,12 +652,6 @@ class APIService(Service):
                 duration=health_status.ping_check["duration"],
                 service_name=service_name
             )
-        
-        if display_results:
-            print(f"\nService: {self.base_url}")
-            print(health_status)
-            
-        return health_status.overall_status
 
     def __str__(self) -> str:
         """
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_MAX_WAIT = 0.005  # seconds
+
+logger = logging.getLogger(__name__)
+
+class BatchBuffer:
+    """
+    Coalesce items submitted in quick succession into batches sent with one call.
+
+    Items are buffered until batch_size of them are waiting or max_wait seconds have passed
+    since the first one, whichever comes first. The send callable receives the buffered items
+    and must return one result per item, in the same order; each submitter gets its own result.
+    If a batch fails, every submitter of that batch gets the exception.
+    """
+    __slots__ = ('_send', 'batch_size', 'max_wait', '_pending', '_timer', '_sending')
+
+    def __init__(self, send: Callable[[List[Any]], Awaitable[List[Any]]],
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_wait: float = DEFAULT_MAX_WAIT):
+        """
+        Initialize the BatchBuffer.
+
+        :param send: A coroutine function sending a list of items and returning their results.
+        :param batch_size: The maximum number of items sent in one batch.
+        :param max_wait: The maximum time in seconds an item waits for others to join its batch.
+        """
+        self._send = send
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._sending: Set[asyncio.Task] = set()
+        logger.info("BatchBuffer initialized with batch_size=%s, max_wait=%s", batch_size, max_wait)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Add an item to the next batch and wait for its result.
+
+        :param item: The item to send.
+        :return: The result of the item.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    async def flush(self) -> None:
+        """
+        Send the buffered items now and wait until every batch in flight has completed.
+        """
+        self._flush()
+        if self._sending:
+            await asyncio.wait(set(self._sending))
+
+    def _flush(self) -> None:
+        """
+        Hand the buffered items over to a background task that sends them.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._deliver(batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _deliver(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """
+        Send one batch and resolve the futures of its submitters.
+
+        :param batch: The (item, future) pairs of the batch.
+        """
+        logger.debug("Sending batch of %s items", len(batch))
+        try:
+            results = await self._send([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ConnectionError(f"Batch of {len(batch)} items returned {len(results)} results")
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            # Submitters cancelled while the batch was in flight are skipped
+            if not future.done():
+                future.set_result(result)
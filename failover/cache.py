@@ -1,24 +1,119 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
 import logging
-from cachetools import TTLCache
-import configparser
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
 
-# Load configuration from config file
-config = configparser.ConfigParser()
-config.read('config.ini')
+from ._config import SETTINGS
 
-DEFAULT_TTL = config.getint('DEFAULT', 'DEFAULT_TTL', fallback=300)
+DEFAULT_TTL = SETTINGS.default_ttl
+DEFAULT_CACHE_SIZE = SETTINGS.default_cache_size
+MAX_CACHE_BYTES = SETTINGS.max_cache_bytes
 
 logger = logging.getLogger(__name__)
 
+def _freeze(value: Any) -> Hashable:
+    """
+    Convert request parameters into a hashable value that does not depend on dict ordering.
+    
+    :param value: The value to convert (dicts and lists are converted recursively).
+    :return: A hashable representation of the value.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted(((k, _freeze(v)) for k, v in value.items()), key=lambda item: str(item[0])))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _digest(value: Any) -> bytes:
+    """
+    Hash a request body into a fixed-size key that does not depend on dict ordering.
+    
+    :param value: The JSON-serializable body.
+    :return: A 16-byte BLAKE2b digest of the body's canonical JSON form.
+    """
+    try:
+        canonical = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    except TypeError:
+        # Keys of mixed types cannot be sorted by json
+        canonical = repr(_freeze(value))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+
+def request_key(method: str, endpoint: str, params: Optional[Dict] = None, data: Any = None) -> Hashable:
+    """
+    Build the cache key of a request.
+    
+    :param method: The HTTP method.
+    :param endpoint: The API endpoint.
+    :param params: The query parameters.
+    :param data: The request body.
+    :return: A hashable key that does not depend on dict ordering.
+    """
+    return (
+        method,
+        endpoint,
+        _freeze(params) if params else None,
+        _digest(data) if data else None
+    )
+
+class _CachedError:
+    """
+    A failure kept in the cache; every hit raises a new copy of the original exception.
+    """
+    __slots__ = ('exc_type', 'args')
+
+    def __init__(self, error: BaseException):
+        self.exc_type = type(error)
+        self.args = error.args
+
+    def rebuild(self) -> BaseException:
+        return self.exc_type(*self.args)
+
 class Cache:
-    def __init__(self, ttl=DEFAULT_TTL):
+    """
+    An in-memory LRU cache whose entries expire after a time-to-live.
+
+    Entries live in an OrderedDict kept in least-recently-used order; expiry times are
+    tracked in a min-heap so expired entries are dropped lazily in expiry order.
+    """
+    def __init__(self, ttl=DEFAULT_TTL, maxsize=DEFAULT_CACHE_SIZE, max_cache_bytes=MAX_CACHE_BYTES):
         """
         Initialize the Cache with a time-to-live (TTL) value.
         
         :param ttl: The time-to-live for cache entries in seconds.
+        :param maxsize: The maximum number of entries kept in the cache.
+        :param max_cache_bytes: Text or bytes values larger than this are not cached.
         """
-        self.cache = TTLCache(maxsize=100, ttl=ttl)
-        logger.info(f"Cache initialized with TTL={ttl}")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.max_cache_bytes = max_cache_bytes
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._counter = itertools.count()
+        self._inflight: Dict[Any, asyncio.Future] = {}
+        logger.info("Cache initialized with TTL=%s, maxsize=%s", ttl, maxsize)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _expire(self, now: float) -> None:
+        """
+        Drop every entry whose expiry time has passed.
+        
+        :param now: The current monotonic time.
+        """
+        heap = self._heap
+        data = self._data
+        while heap and heap[0][0] <= now:
+            expiry, _, key = heapq.heappop(heap)
+            entry = data.get(key)
+            # The key may have been overwritten or evicted since this heap entry was pushed
+            if entry is not None and entry[0] == expiry:
+                del data[key]
 
     def get(self, key):
         """
@@ -27,16 +122,118 @@ class Cache:
         :param key: The key to look up in the cache.
         :return: The value associated with the key, or None if the key is not found.
         """
-        value = self.cache.get(key)
-        logger.debug(f"Cache get: key={key}, value={value}")
-        return value
+        value = self._lookup(key)
+        return None if type(value) is _CachedError else value
 
-    def set(self, key, value):
+    def _lookup(self, key):
+        """
+        Retrieve a cached value or cached failure by key.
+        
+        :param key: The key to look up in the cache.
+        :return: The stored value (possibly a _CachedError), or None if the key is not found.
+        """
+        self._expire(time.monotonic())
+        entry = self._data.get(key)
+        if entry is None:
+            logger.debug("Cache get: key=%s, value=None", key)
+            return None
+        self._data.move_to_end(key)
+        logger.debug("Cache get: key=%s, value=%s", key, entry[1])
+        return entry[1]
+
+    def set(self, key, value, ttl: Optional[float] = None):
         """
         Set a value in the cache with the specified key.
         
         :param key: The key to associate with the value.
         :param value: The value to store in the cache.
+        :param ttl: The time-to-live of this entry in seconds; defaults to the cache TTL.
+            A TTL of zero or less means the value must not be cached.
+        """
+        if ttl is None:
+            ttl = self.ttl
+        elif ttl <= 0:
+            # Never serve an older copy of a value the origin says not to store
+            self._data.pop(key, None)
+            return
+        if isinstance(value, str):
+            # Cheap length check first; only encode when the text might be over the limit
+            size = len(value) if len(value) * 4 <= self.max_cache_bytes else len(value.encode())
+        elif isinstance(value, (bytes, bytearray)):
+            size = len(value)
+        else:
+            size = 0
+        if size > self.max_cache_bytes:
+            logger.debug("Cache skip: key=%s, %s bytes exceeds max_cache_bytes=%s", key, size, self.max_cache_bytes)
+            return
+        now = time.monotonic()
+        self._expire(now)
+        expiry = now + ttl
+        data = self._data
+        data[key] = (expiry, value)
+        data.move_to_end(key)
+        while len(data) > self.maxsize:
+            data.popitem(last=False)
+        heapq.heappush(self._heap, (expiry, next(self._counter), key))
+        # Overwrites and LRU evictions leave stale heap entries behind; rebuild when they pile up
+        if len(self._heap) > 2 * self.maxsize:
+            self._heap = [(exp, next(self._counter), k) for k, (exp, _) in data.items()]
+            heapq.heapify(self._heap)
+        logger.debug("Cache set: key=%s, value=%s", key, value)
+
+    async def get_or_compute(self, key, coro_factory: Callable[[], Awaitable[Any]], with_ttl: bool = False):
         """
-        self.cache.setdefault(key, value)
-        logger.debug(f"Cache set: key={key}, value={value}")
+        Return the cached value for the key, computing it on a miss.
+
+        Concurrent misses for the same key are coalesced: only the first caller runs
+        the factory, the others await its result (or its exception). If that caller is
+        cancelled, one of the waiters runs the factory instead. An exception with a
+        ``cache_ttl`` attribute is cached for that many seconds and raised again on hits.
+        
+        :param key: The key to look up in the cache.
+        :param coro_factory: A callable returning an awaitable that produces the value.
+        :param with_ttl: If True, the awaitable produces a (value, ttl) pair and ttl is passed to set().
+        :return: The cached or freshly computed value.
+        """
+        value = self._lookup(key)
+        if value is not None:
+            if type(value) is _CachedError:
+                raise value.rebuild()
+            return value
+
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            logger.debug("Cache miss already in flight: key=%s", key)
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    # This caller was cancelled, not the one computing the value
+                    raise
+            # The computing caller was cancelled; another waiter may have taken over already
+            inflight = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await coro_factory()
+            ttl = None
+            if with_ttl:
+                value, ttl = value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            cache_ttl = getattr(e, 'cache_ttl', None)
+            if cache_ttl:
+                self.set(key, _CachedError(e), cache_ttl)
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
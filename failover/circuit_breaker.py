@@ -1,35 +1,130 @@
+import random
 import time
 import logging
-import configparser
-from typing import Dict
+import weakref
+from array import array
+from typing import Dict, List, Optional
 
-from failover.metrics import MetricsCollector
+from prometheus_client import Counter
+
+from failover.metrics import get_metrics
+from ._config import SETTINGS
+from .circuit_state import StateStore
+from .clock import LOOP_CLOCK, LoopClock
 from .service import Service  # Corrected import
 
 logger = logging.getLogger(__name__)
 
-# Load configuration from config file
-config = configparser.ConfigParser()
-config.read('config.ini')
+# Module-level bindings read on every request; one global lookup instead of a global plus an attribute
+_monotonic = time.monotonic
+_random = random.random
+_DEBUG = logging.DEBUG
+
+DEFAULT_FAILURE_THRESHOLD = SETTINGS.failure_threshold
+DEFAULT_RECOVERY_TIME = SETTINGS.recovery_time
+
+# Circuit states as stored in CircuitBreaker.state; names are only used by get_state, logs and the store
+CLOSED, OPEN, HALF_OPEN = 0, 1, 2
+_NAMES = ('CLOSED', 'OPEN', 'HALF_OPEN')
+# bytearray.translate table used by allow_mask: CLOSED/HALF_OPEN -> 1, OPEN -> 0
+_ALLOW_TABLE = bytes(0 if state == OPEN else 1 for state in range(256))
+
+class CircuitOpenError(Exception):
+    """
+    Raised by CircuitBreaker.call when the circuit does not let the request through.
 
-DEFAULT_FAILURE_THRESHOLD = config.getint('DEFAULT', 'DEFAULT_FAILURE_THRESHOLD', fallback=3)
-DEFAULT_RECOVERY_TIME = config.getint('DEFAULT', 'DEFAULT_RECOVERY_TIME', fallback=60)
+    Callers that can skip a service should check allow_request first, as FailoverManager does,
+    so that an outage does not turn every request into a raised exception.
+    """
+    def __init__(self, message: str = "Circuit is open"):
+        super().__init__(message)
 
 class CircuitBreaker:
-    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, recovery_time: int = DEFAULT_RECOVERY_TIME):
+    __slots__ = ('_clock', '_now', 'failure_threshold', 'recovery_time', '_idx', '_free_slots',
+                 'failure_counts', '_retry_at', 'state', 'half_open_success_counts', '_fail_counters',
+                 'half_open_successes_required', 'half_open_probe_ratio', 'metrics', 'store', 'local_ttl')
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, recovery_time: int = DEFAULT_RECOVERY_TIME,
+                 store: Optional[StateStore] = None, local_ttl: float = 1.0,
+                 half_open_successes_required: int = 3, half_open_probe_ratio: float = 0.1,
+                 use_precise_clock: bool = False, clock: Optional[LoopClock] = None):
         """
         Initialize the CircuitBreaker with a failure threshold and recovery time.
         
         :param failure_threshold: The number of failures before the circuit opens.
         :param recovery_time: The time to wait before attempting to close the circuit.
+        :param store: An optional StateStore sharing open circuits with other processes.
+        :param local_ttl: How long, in seconds, a state read from the store is reused locally.
+        :param half_open_successes_required: Consecutive successes needed to close a half-open circuit.
+        :param half_open_probe_ratio: Fraction of requests let through while the circuit is half-open.
+        :param use_precise_clock: Read time.monotonic() on every check instead of the per-loop-iteration
+            LoopClock, which lags by the duration of the current loop iteration.
+        :param clock: The LoopClock to read; defaults to the clock shared by the process.
         """
+        # Elapsed-time source for the recovery window; only durations are compared, never wall-clock times
+        self._clock = clock or LOOP_CLOCK
+        self._now = _monotonic if use_precise_clock else self._clock.now
         self.failure_threshold = failure_threshold
         self.recovery_time = recovery_time
-        self.failure_counts: Dict[Service, int] = {}
-        self.last_failure_time: Dict[Service, float] = {}
-        self.state: Dict[Service, str] = {}
-        self.metrics = MetricsCollector()
-        logger.info(f"CircuitBreaker initialized with failure_threshold={failure_threshold}, recovery_time={recovery_time}")
+        # Per-service state in parallel arrays, indexed through _idx by id(service)
+        self._idx: Dict[int, int] = {}
+        self._free_slots: List[int] = []
+        self.failure_counts = array('l')
+        # Earliest time an open circuit lets a probe through: last failure + recovery_time
+        self._retry_at = array('d')
+        self.state = bytearray()
+        self.half_open_success_counts = array('l')
+        # Failure counter of each service with its labels already bound
+        self._fail_counters: List[Counter] = []
+        self.half_open_successes_required = half_open_successes_required
+        self.half_open_probe_ratio = half_open_probe_ratio
+        self.metrics = get_metrics()
+        self.store = store
+        self.local_ttl = local_ttl
+        logger.info("CircuitBreaker initialized with failure_threshold=%s, recovery_time=%s", failure_threshold, recovery_time)
+
+    def register(self, service: Service) -> int:
+        """
+        Allocate the state slots of a service; services are registered on first use otherwise.
+
+        Services are tracked by id() and their slots are freed when they are garbage collected.
+        
+        :param service: The service to track.
+        :return: The index of the service in the state arrays.
+        """
+        key = id(service)
+        idx = self._idx.get(key)
+        if idx is not None:
+            return idx
+        counter = self.metrics.labelled('request_counter', service.__class__.__name__, "unknown", "failure")
+        if self._free_slots:
+            idx = self._free_slots.pop()
+            self.failure_counts[idx] = 0
+            self._retry_at[idx] = 0.0
+            self.state[idx] = CLOSED
+            self.half_open_success_counts[idx] = 0
+            self._fail_counters[idx] = counter
+        else:
+            idx = len(self.state)
+            self.failure_counts.append(0)
+            self._retry_at.append(0.0)
+            self.state.append(CLOSED)
+            self.half_open_success_counts.append(0)
+            self._fail_counters.append(counter)
+        self._idx[key] = idx
+        # The id may be reused by another object once this service is gone
+        weakref.finalize(service, self._drop, key)
+        return idx
+
+    def _drop(self, key: int):
+        """
+        Forget a garbage-collected service and make its slot reusable.
+        
+        :param key: The id() of the service.
+        """
+        idx = self._idx.pop(key, None)
+        if idx is not None:
+            self._free_slots.append(idx)
 
     async def call(self, service: Service, *args, **kwargs):
         """
@@ -39,33 +134,32 @@ class CircuitBreaker:
         :param args: Positional arguments for the service call.
         :param kwargs: Keyword arguments for the service call.
         :return: The result of the service call.
+        :raises CircuitOpenError: If the circuit does not allow the call.
         """
-        state = self.state.get(service, 'CLOSED')
-        logger.debug(f"Calling service {service} with state {state}")
-        if state == 'OPEN':
-            time_since_failure = time.time() - self.last_failure_time.get(service, 0)
-            if time_since_failure < self.recovery_time:
-                raise Exception("Circuit is open")
+        idx = self._idx.get(id(service))
+        if idx is None:
+            idx = self.register(service)
+        state = self.state[idx]
+        if logger.isEnabledFor(_DEBUG):
+            logger.debug("Calling service %s with state %s", service, _NAMES[state])
+        if state == OPEN:
+            if self._now() < self._retry_at[idx]:
+                raise CircuitOpenError
             else:
-                self.state[service] = 'HALF_OPEN'
+                self._enter_half_open(idx)
+        elif state == HALF_OPEN and _random() >= self.half_open_probe_ratio:
+            raise CircuitOpenError
 
         try:
             result = await service.call(*args, **kwargs)
-            self.state[service] = 'CLOSED'
-            self.failure_counts[service] = 0
-            logger.info(f"Service {service} call successful")
+            self._record_success(service, idx)
+            logger.info("Service %s call successful", service)
             return result
         except Exception as e:
-            self.failure_counts[service] += 1
-            self.last_failure_time[service] = time.time()
-            self.metrics.request_counter.labels(
-                service=service.__class__.__name__,
-                endpoint="unknown",
-                status="failure"
-            ).inc()
-            logger.error(f"Service {service} call failed: {str(e)}")
-            if self.failure_counts[service] >= self.failure_threshold:
-                self.state[service] = 'OPEN'
+            # Other tasks may have moved the circuit while this call was awaited, so the state read
+            # above is stale here; _record_failure decides on the current state
+            logger.error("Service %s call failed: %s", service, e)
+            self._record_failure(service, idx)
             raise e
 
     def allow_request(self, service: Service) -> bool:
@@ -75,27 +169,87 @@ class CircuitBreaker:
         :param service: The service to check.
         :return: True if the request is allowed, False otherwise.
         """
-        state = self.state.get(service, 'CLOSED')
-        logger.debug(f"Allow request for service {service} with state {state}")
-        if state == 'OPEN':
-            time_since_failure = time.time() - self.last_failure_time.get(service, 0)
-            if time_since_failure > self.recovery_time:
-                self.state[service] = 'HALF_OPEN'
+        idx = self._idx.get(id(service))
+        state = self.state[idx] if idx is not None else CLOSED
+        if state == CLOSED and self.store is None:
+            # Steady state: nothing to check, no logging
+            return True
+        if idx is None:
+            idx = self.register(service)
+        if logger.isEnabledFor(_DEBUG):
+            logger.debug("Allow request for service %s with state %s", service, _NAMES[state])
+        if self.store is not None and state != OPEN:
+            # Another process may already have opened this circuit
+            if self.store.get_cached(self._store_key(service), self.local_ttl) == _NAMES[OPEN]:
+                logger.debug("Circuit breaker is OPEN for %s in the shared store. Skipping request.", service)
+                return False
+        if state == OPEN:
+            if self._now() >= self._retry_at[idx]:
+                self._enter_half_open(idx)
                 return True
             else:
-                logger.debug(f"Circuit breaker is OPEN for {service}. Skipping request.")
+                logger.debug("Circuit breaker is OPEN for %s. Skipping request.", service)
                 return False
+        if state == HALF_OPEN:
+            # Only let a fraction of the traffic probe a recovering service
+            return _random() < self.half_open_probe_ratio
         return True
 
+    def allow_mask(self, now: Optional[float] = None) -> bytearray:
+        """
+        Check every registered circuit at once, indexed like the state arrays (see register()).
+
+        A slot is 1 if its circuit is CLOSED or HALF_OPEN, or OPEN past its retry deadline. This is
+        a side-effect free pre-filter: it does not move circuits to HALF_OPEN, sample half-open
+        probes or consult the shared store, so allowed services still go through allow_request.
+        
+        :param now: The time to check against, in the breaker's clock; defaults to now.
+        :return: One byte per slot, 1 if a request may be let through and 0 otherwise.
+        """
+        state = self.state
+        # Map the states in a single C pass, then only visit the open circuits
+        mask = state.translate(_ALLOW_TABLE)
+        idx = state.find(OPEN)
+        if idx != -1:
+            if now is None:
+                now = self._now()
+            retry_at = self._retry_at
+            while idx != -1:
+                if now >= retry_at[idx]:
+                    mask[idx] = 1
+                idx = state.find(OPEN, idx + 1)
+        return mask
+
     def record_success(self, service: Service):
         """
-        Record a successful request and close the circuit if it was open.
+        Record a successful request and close the circuit once it has recovered.
+
+        A half-open circuit only closes after half_open_successes_required consecutive successes.
+        
+        :param service: The service that succeeded.
+        """
+        idx = self._idx.get(id(service))
+        if idx is None:
+            idx = self.register(service)
+        self._record_success(service, idx)
+
+    def _record_success(self, service: Service, idx: int):
+        """
+        record_success for a service whose slot index is already known.
         
         :param service: The service that succeeded.
+        :param idx: The index of the service in the state arrays.
         """
-        self.failure_counts[service] = 0
-        self.state[service] = 'CLOSED'
-        logger.info(f"Service {service} recorded success")
+        if self.state[idx] == HALF_OPEN:
+            successes = self.half_open_success_counts[idx] + 1
+            if successes < self.half_open_successes_required:
+                self.half_open_success_counts[idx] = successes
+                logger.info("Service %s recorded half-open success %s/%s", service, successes, self.half_open_successes_required)
+                return
+        self.half_open_success_counts[idx] = 0
+        self.failure_counts[idx] = 0
+        self._set_state(service, idx, CLOSED)
+        logger.info("Service %s recorded success", service)
 
     def record_failure(self, service: Service):
         """
@@ -103,18 +257,81 @@ class CircuitBreaker:
         
         :param service: The service that failed.
         """
-        count = self.failure_counts.get(service, 0) + 1
-        self.failure_counts[service] = count
-        self.last_failure_time[service] = time.time()
-        self.metrics.request_counter.labels(
-            service=service.__class__.__name__,
-            endpoint="unknown",
-            status="failure"
-        ).inc()
-        if count >= self.failure_threshold:
-            self.state[service] = 'OPEN'
-            logger.warning(f"Circuit breaker opened for {service}.")
-        logger.warning(f"Service {service} recorded failure, count={self.failure_counts[service]}")
+        idx = self._idx.get(id(service))
+        if idx is None:
+            idx = self.register(service)
+        self._record_failure(service, idx)
+
+    def _record_failure(self, service: Service, idx: int):
+        """
+        record_failure for a service whose slot index is already known.
+        
+        :param service: The service that failed.
+        :param idx: The index of the service in the state arrays.
+        """
+        count = self.failure_counts[idx] + 1
+        self.failure_counts[idx] = count
+        self._retry_at[idx] = self._now() + self.recovery_time
+        self._fail_counters[idx].inc()
+        # A failed probe re-opens a half-open circuit immediately
+        state = self.state[idx]
+        if state != OPEN and (count >= self.failure_threshold or state == HALF_OPEN):
+            self._set_state(service, idx, OPEN)
+            logger.warning("Circuit breaker opened for %s.", service)
+        logger.warning("Service %s recorded failure, count=%s", service, count)
+
+    def _transition(self, idx: int, expected: int, new: int) -> bool:
+        """
+        Compare-and-set a circuit state: move it to new only if it is still expected.
+
+        Nothing here awaits, so no other task can run between the check and the write; callers
+        holding a state read before an await use this instead of overwriting a newer state.
+        
+        :param idx: The index of the service in the state arrays.
+        :param expected: The state the caller last observed.
+        :param new: The state to move to.
+        :return: True if the state was changed, False if another task changed it first.
+        """
+        if self.state[idx] != expected:
+            return False
+        self.state[idx] = new
+        return True
+
+    def _enter_half_open(self, idx: int) -> bool:
+        """
+        Move an open circuit to HALF_OPEN and restart the count of recovery successes.
+        
+        :param idx: The index of the service whose circuit is probed again.
+        :return: True if this call moved the circuit, False if it was no longer OPEN.
+        """
+        if not self._transition(idx, OPEN, HALF_OPEN):
+            return False
+        self.half_open_success_counts[idx] = 0
+        return True
+
+    def _store_key(self, service: Service) -> str:
+        """
+        Return the key identifying the service's circuit in the shared store.
+        
+        :param service: The service.
+        :return: A key that is stable across processes.
+        """
+        return getattr(service, 'base_url', None) or service.__class__.__name__
+
+    def _set_state(self, service: Service, idx: int, state: int):
+        """
+        Change the circuit state and share OPEN/CLOSED transitions through the store.
+        
+        :param service: The service whose circuit changes.
+        :param idx: The index of the service in the state arrays.
+        :param state: The new state (CLOSED, OPEN or HALF_OPEN).
+        """
+        previous = self.state[idx]
+        self.state[idx] = state
+        if self.store is not None and state != previous:
+            # An OPEN entry expires on its own once the recovery time has elapsed
+            ttl = self.recovery_time if state == OPEN else None
+            self.store.publish(self._store_key(service), _NAMES[state], ttl)
 
     def get_state(self, service: Service) -> str:
         """
@@ -123,7 +340,8 @@ class CircuitBreaker:
         :param service: The service to check.
         :return: The current state of the circuit.
         """
-        return self.state.get(service, 'CLOSED')
+        idx = self._idx.get(id(service))
+        return _NAMES[CLOSED] if idx is None else _NAMES[self.state[idx]]
 
     def get_failure_count(self, service: Service) -> int:
         """
@@ -132,13 +350,18 @@ class CircuitBreaker:
         :param service: The service to check.
         :return: The current failure count.
         """
-        return self.failure_counts.get(service, 0)
+        idx = self._idx.get(id(service))
+        return 0 if idx is None else self.failure_counts[idx]
 
     def get_last_failure_time(self, service: Service) -> float:
         """
         Get the last failure time for the given service.
         
         :param service: The service to check.
-        :return: The last failure time as a timestamp.
+        :return: The last failure time, in time.monotonic() seconds (not a wall-clock timestamp).
         """
-        return self.last_failure_time.get(service, 0)
+        idx = self._idx.get(id(service))
+        if idx is None or not self._retry_at[idx]:
+            return 0
+        # Only the retry deadline is stored
+        return self._retry_at[idx] - self.recovery_time
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncContextManager, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+class StateStore(ABC):
+    """
+    Abstract store sharing circuit breaker states between processes.
+
+    Reads go through a small local cache so that the synchronous circuit breaker checks never
+    wait on the network: a stale entry is returned immediately and refreshed in the background.
+    Writes are fire-and-forget tasks.
+    """
+    def __init__(self):
+        """
+        Initialize the local read cache and the set of pending background tasks.
+        """
+        self._local: Dict[str, Tuple[Optional[str], float]] = {}
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Read the shared state of a circuit.
+
+        :param key: The circuit key.
+        :return: The shared state, or None if no state is shared for this circuit.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, state: str, ttl: Optional[float] = None) -> None:
+        """
+        Write the shared state of a circuit.
+
+        :param key: The circuit key.
+        :param state: The new state.
+        :param ttl: Seconds after which the shared state expires, or None to keep it.
+        """
+
+    @abstractmethod
+    def with_lock(self, key: str) -> AsyncContextManager:
+        """
+        Return an async context manager holding a lock for the given circuit.
+
+        :param key: The circuit key.
+        :return: The lock context manager.
+        """
+
+    def get_cached(self, key: str, ttl: float = 1.0) -> Optional[str]:
+        """
+        Return the locally cached shared state, refreshing it in the background when stale.
+
+        :param key: The circuit key.
+        :param ttl: Maximum age in seconds of the local copy before a refresh is scheduled.
+        :return: The last known shared state, or None if it has not been fetched yet.
+        """
+        state, fetched_at = self._local.get(key, (None, 0.0))
+        if time.monotonic() - fetched_at >= ttl and key not in self._refreshing:
+            self._refreshing.add(key)
+            if not self._spawn(self._refresh(key)):
+                self._refreshing.discard(key)
+        return state
+
+    def publish(self, key: str, state: str, ttl: Optional[float] = None) -> None:
+        """
+        Update the local copy and write the state to the shared store in the background.
+
+        :param key: The circuit key.
+        :param state: The new state.
+        :param ttl: Seconds after which the shared state expires, or None to keep it.
+        """
+        self._local[key] = (state, time.monotonic())
+        self._spawn(self._write(key, state, ttl))
+
+    async def _refresh(self, key: str) -> None:
+        try:
+            self._local[key] = (await self.get(key), time.monotonic())
+        finally:
+            self._refreshing.discard(key)
+
+    async def _write(self, key: str, state: str, ttl: Optional[float]) -> None:
+        async with self.with_lock(key):
+            await self.set(key, state, ttl)
+
+    def _spawn(self, coro) -> bool:
+        """
+        Run a coroutine as a background task on the running event loop.
+
+        :param coro: The coroutine to run.
+        :return: True if the task was scheduled, False if no event loop is running.
+        """
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            coro.close()
+            return False
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return True
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Circuit state store operation failed: %s", task.exception())
+
+class RedisStateStore(StateStore):
+    """
+    StateStore backed by Redis through redis.asyncio.
+
+    Requires the optional ``redis`` package.
+    """
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "failover:circuit:",
+                 lock_timeout: float = 5.0, client=None):
+        """
+        Initialize the RedisStateStore.
+
+        :param url: The Redis connection URL, used when no client is given.
+        :param prefix: The prefix of the Redis keys holding circuit states.
+        :param lock_timeout: Seconds after which a transition lock is released automatically.
+        :param client: An existing redis.asyncio client to use instead of connecting to the URL.
+        """
+        super().__init__()
+        if client is None:
+            import redis.asyncio as redis
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self._redis = client
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+        logger.info("RedisStateStore initialized with prefix=%s", prefix)
+
+    async def get(self, key: str) -> Optional[str]:
+        state = await self._redis.get(self.prefix + key)
+        if isinstance(state, bytes):
+            state = state.decode()
+        return state
+
+    async def set(self, key: str, state: str, ttl: Optional[float] = None) -> None:
+        if ttl:
+            await self._redis.set(self.prefix + key, state, px=int(ttl * 1000))
+        else:
+            await self._redis.set(self.prefix + key, state)
+
+    def with_lock(self, key: str) -> AsyncContextManager:
+        return self._redis.lock(self.prefix + key + ":lock", timeout=self.lock_timeout)
+
+    async def close(self) -> None:
+        """
+        Close the underlying Redis connection.
+        """
+        await self._redis.close()
@@ -0,0 +1,50 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class LoopClock:
+    """
+    time.monotonic() cached for one iteration of the running event loop.
+
+    The first read in a loop iteration reads the clock and schedules an invalidation with
+    loop.call_soon, so every task woken in the same iteration sees the same timestamp. Nothing is
+    rescheduled while the clock is idle, which keeps the loop free to sleep. Outside a running loop
+    every read goes to the clock, and a timestamp cached under another loop (one that stopped
+    before its invalidation ran) is never returned. An instance must only be used from one thread.
+    """
+    def __init__(self):
+        """
+        Initialize the LoopClock with no cached timestamp.
+        """
+        self._ts: Optional[float] = None
+        # Loop the cached timestamp was read under; a value cached under another loop is ignored
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def now(self) -> float:
+        """
+        Return the monotonic timestamp of the current loop iteration.
+
+        :return: A monotonic timestamp in seconds.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return time.monotonic()
+        ts = self._ts
+        if ts is not None and self._loop is loop:
+            return ts
+        ts = time.monotonic()
+        loop.call_soon(self._invalidate)
+        self._ts = ts
+        self._loop = loop
+        return ts
+
+    def _invalidate(self) -> None:
+        self._ts = None
+        self._loop = None
+
+# Shared by all circuit breakers of the process
+LOOP_CLOCK = LoopClock()
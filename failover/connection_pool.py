@@ -1,41 +1,74 @@
 import asyncio
 import logging
-import configparser
+from collections import deque
+from typing import Deque
 
-# Load configuration from config file
-config = configparser.ConfigParser()
-config.read('config.ini')
+from ._config import SETTINGS
 
-DEFAULT_MAX_SIZE = config.getint('DEFAULT', 'DEFAULT_MAX_SIZE', fallback=10)
+DEFAULT_MAX_SIZE = SETTINGS.default_max_size
 
 logger = logging.getLogger(__name__)
 
 class ConnectionPool:
+    """
+    Limit on the number of concurrent requests to a service.
+
+    The pool hands out slots, not connections: the sockets themselves are pooled and reused by
+    the aiohttp connector of each APIService session.
+    """
+    __slots__ = ('_avail', '_waiters')
+
     def __init__(self, max_size=DEFAULT_MAX_SIZE):
         """
         Initialize the ConnectionPool with a maximum size.
         
         :param max_size: The maximum number of concurrent connections.
         """
-        self._semaphore = asyncio.Semaphore(max_size)
-        self._connections = []
-        logger.info(f"ConnectionPool initialized with max_size={max_size}")
+        # Free slots; tasks only queue on _waiters once the pool is saturated
+        self._avail = max_size
+        self._waiters: Deque[asyncio.Future] = deque()
+        logger.info("ConnectionPool initialized with max_size=%s", max_size)
 
     async def acquire(self):
         """
         Acquire a connection from the pool.
         """
-        await self._semaphore.acquire()
-        logger.debug("Connection acquired")
-        # Connection logic here
+        if self._avail > 0 and not self._waiters:
+            self._avail -= 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over before the cancellation; pass it on
+                    self._wake_next()
+                raise
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Connection acquired")
         return self
 
-    async def release(self):
+    def release(self):
         """
         Release a connection back to the pool.
+
+        Waking a waiter never blocks, so this is a plain method and does not need to be awaited.
+        """
+        self._wake_next()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Connection released")
+
+    def _wake_next(self):
+        """
+        Hand a free slot to the oldest waiting task, or return it to the pool if nobody waits.
         """
-        self._semaphore.release()
-        logger.debug("Connection released")
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._avail += 1
 
     async def __aenter__(self):
         """
@@ -48,4 +81,4 @@ class ConnectionPool:
         """
         Exit the runtime context related to this object.
         """
-        await self.release()
+        self.release()
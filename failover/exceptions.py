@@ -0,0 +1,33 @@
+from typing import Any, List, Optional, Sequence, Tuple
+
+class AllServicesFailedError(Exception):
+    """
+    Raised when no service could answer a request: every allowed service failed or every
+    circuit was open.
+    """
+    def __init__(self, failures: Sequence[Tuple[Any, BaseException]] = ()):
+        """
+        Initialize the error with the failures that led to it.
+
+        :param failures: The (service, exception) pairs of the services that were tried, in order.
+            Empty when no service was allowed to take the request.
+        """
+        super().__init__("All services failed.")
+        self.failures: List[Tuple[Any, BaseException]] = list(failures)
+
+class RateLimitExceededError(Exception):
+    """
+    Raised when a service still answers 429 after every rate-limit retry was used.
+
+    Not a ConnectionError, so retry policies do not start another round of requests against
+    a service that asked to be left alone.
+    """
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        """
+        Initialize the error with the delay the service last asked for.
+
+        :param message: The error message.
+        :param retry_after: The delay requested by the server in seconds, if it sent one.
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
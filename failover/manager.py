@@ -1,20 +1,61 @@
-from asyncio.log import logger
-from typing import Dict
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from failover._config import SETTINGS
+from failover.cache import Cache, request_key
 from failover.circuit_breaker import CircuitBreaker
+from failover.exceptions import AllServicesFailedError
+from failover.metrics import start_metrics_server
 from failover.policies import RetryPolicy
 from failover.service import Service
 
+logger = logging.getLogger(__name__)
+
+# Refresh well before the health results cached by the services expire
+HEALTH_CHECK_INTERVAL = SETTINGS.health_ttl / 2  # seconds
+# Hedging waits for the observed latency percentile of a service once enough samples exist
+HEDGE_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+HEDGE_LATENCY_WINDOW = 100
+# Only requests that may safely reach two services at once are hedged
+HEDGE_METHODS = frozenset({'GET'})
+
 class FailoverManager:
-    def __init__(self, retry_policy: RetryPolicy, circuit_breaker: CircuitBreaker):
+    def __init__(self, retry_policy: RetryPolicy, circuit_breaker: CircuitBreaker,
+                 metrics_port: Optional[int] = None, hedge_delay: Optional[float] = None,
+                 cache: Optional[Cache] = None, hedge_methods: Iterable[str] = HEDGE_METHODS):
         """
         Initialize the FailoverManager with a retry policy and a circuit breaker.
         
         :param retry_policy: The policy to use for retrying failed requests.
         :param circuit_breaker: The circuit breaker to manage service failures.
+        :param metrics_port: If set, expose Prometheus metrics on this port (started once per process).
+        :param hedge_delay: If set, send the request to the next service when the current one has not
+            answered after this many seconds (or its observed p95 latency, once known) and use the
+            first success. Only methods in hedge_methods are hedged: a write sent to a second
+            service while the first may still apply it would be applied twice, so the other
+            methods always try the services one after the other, as when hedge_delay is None.
+        :param cache: If set, GET responses are cached here whichever service produced them, and
+            cache hits are answered without selecting a service. Entries live as long as the
+            producing service allows (e.g. from Cache-Control), or the cache's TTL otherwise;
+            those GET requests skip the services' own caches.
+        :param hedge_methods: The HTTP methods that may be hedged; only GET by default.
         """
         self.services = []
+        # Failover order as (service, circuit breaker slot); the last service to succeed comes first
+        self._ordered: Tuple[Tuple[Service, int], ...] = ()
         self.retry_policy = retry_policy
         self.circuit_breaker = circuit_breaker
+        self._health_task: Optional[asyncio.Task] = None
+        self.hedge_delay = hedge_delay
+        self.hedge_methods: FrozenSet[str] = frozenset(hedge_methods)
+        self.cache = cache
+        # Recent successful latencies per circuit breaker slot, only kept when hedging
+        self._latencies: Dict[int, Deque[float]] = {}
+        if metrics_port is not None:
+            start_metrics_server(metrics_port)
         logger.info("FailoverManager initialized")
 
     def register_service(self, service: Service):
@@ -24,33 +65,242 @@ class FailoverManager:
         :param service: The service to register.
         """
         self.services.append(service)
-        logger.info(f"Service {service} registered")
+        slot = self.circuit_breaker.register(service)
+        self._ordered += ((service, slot),)
+        logger.info("Service %s registered", service)
+
+    def start_health_checks(self, interval: float = HEALTH_CHECK_INTERVAL):
+        """
+        Check the health of the registered services in the background every interval seconds.
+
+        Services reuse the latest result on their request path, so requests stop waiting on
+        inline DNS and connectivity checks. Must be called with a running event loop.
+        
+        :param interval: The number of seconds between two rounds of health checks.
+        """
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.get_running_loop().create_task(self._health_loop(interval))
+            logger.info("Background health checks started with interval=%s", interval)
+
+    async def _health_loop(self, interval: float):
+        """
+        Verify the health of all registered services concurrently, forever.
+
+        A service whose last healthy status is younger than interval, for instance because a
+        request just checked it, is not probed again in that round.
+        
+        :param interval: The number of seconds between two rounds of health checks.
+        """
+        while True:
+            services = [service for service in self.services if hasattr(service, 'verify_service_health')]
+            results = await asyncio.gather(
+                *(service.verify_service_health(display_results=False, max_age=interval) for service in services),
+                return_exceptions=True
+            )
+            for service, result in zip(services, results):
+                if isinstance(result, Exception):
+                    logger.warning("Background health check of %s failed: %s", service, result)
+            await asyncio.sleep(interval)
+
+    async def close(self):
+        """
+        Stop the background health checks and close the registered services that hold network
+        resources, such as their HTTP sessions.
+        """
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for service in self.services:
+            close = getattr(service, 'close', None)
+            if close is not None:
+                await close()
+        logger.info("FailoverManager closed")
+
+    async def __aenter__(self) -> 'FailoverManager':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
 
     async def execute(self, endpoint: str, method: str = 'GET', params: Dict = None, data: Dict = None) -> str:
         """
         Execute a request to the registered services with failover and retry logic.
+
+        Services are tried in registration order until one fails over to another, which is then
+        tried first by later requests. With hedge_delay set, a slow service is raced against the
+        next one for the methods in hedge_methods.
         
         :param endpoint: The API endpoint to request.
-        :param method: The HTTP method to use (GET, POST, PUT, DELETE).
+        :param method: The HTTP method to use (GET, POST, PUT, PATCH, DELETE).
         :param params: The query parameters for the request.
         :param data: The data to send in the request body.
         :return: The response text from the service.
-        :raises Exception: If all services fail.
+        :raises AllServicesFailedError: If all services fail.
+        """
+        if self.cache is not None and method == 'GET':
+            # Concurrent misses for the same request share one failover run
+            return await self.cache.get_or_compute(
+                request_key(method, endpoint, params, data),
+                lambda: self._execute(endpoint, method, params, data),
+                with_ttl=True
+            )
+        text, _ = await self._execute(endpoint, method, params, data)
+        return text
+
+    async def _execute(self, endpoint: str, method: str, params: Optional[Dict],
+                       data: Optional[Dict]) -> Tuple[str, Optional[float]]:
         """
-        if not self.services:
+        Send a request to the registered services with failover, bypassing the shared cache.
+        
+        :param endpoint: The API endpoint to request.
+        :param method: The HTTP method to use.
+        :param params: The query parameters for the request.
+        :param data: The data to send in the request body.
+        :return: The response text from the service and how long it may be cached.
+        :raises AllServicesFailedError: If all services fail.
+        """
+        ordered = self._ordered
+        if not ordered:
             logger.error("No services registered.")
             raise Exception("No services registered.")
-        for service in self.services:
-            if not self.circuit_breaker.allow_request(service):
-                logger.debug(f"Request not allowed for service {service}")
-                continue
-            try:
-                result = await self.retry_policy.execute_with_retry(service.request, endpoint, method=method, params=params, data=data)
-                self.circuit_breaker.record_success(service)
-                logger.info(f"Service {service} responded successfully.")
-                return result
-            except Exception as e:
-                self.circuit_breaker.record_failure(service)
-                logger.error(f"Service {service} failed with error: {e}.")
+        candidates = self._allowed(ordered)
+        hedge = self.hedge_delay is not None and method in self.hedge_methods
+        # At most two attempts run at once: the current service and, when hedging, the next one
+        attempts: Dict[asyncio.Task, Tuple[Service, int]] = {}
+        failures: List[Tuple[Service, BaseException]] = []
+        try:
+            while True:
+                if not attempts:
+                    entry = next(candidates, None)
+                    if entry is None:
+                        break
+                    attempts[self._start_attempt(entry, endpoint, method, params, data)] = entry
+                timeout = None
+                if hedge and len(attempts) == 1:
+                    timeout = self._hedge_after(next(iter(attempts.values()))[1])
+                done, _ = await asyncio.wait(attempts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # The current service is slow: race it against the next one
+                    entry = next(candidates, None)
+                    if entry is not None:
+                        logger.debug("Hedging request to %s with %s", endpoint, entry[0])
+                        attempts[self._start_attempt(entry, endpoint, method, params, data)] = entry
+                    continue
+                for task in done:
+                    entry = attempts.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        self._promote(entry)
+                        return task.result()
+                    failures.append((entry[0], error))
+        finally:
+            for task in attempts:
+                task.cancel()
         logger.error("All services failed.")
-        raise Exception("All services failed.")
+        if failures:
+            raise AllServicesFailedError(failures) from failures[-1][1]
+        raise AllServicesFailedError()
+
+    def _allowed(self, ordered: Tuple[Tuple[Service, int], ...]) -> Iterator[Tuple[Service, int]]:
+        """
+        Yield, in failover order, the services whose circuit lets a request through.
+
+        Services are checked lazily, as they are about to be tried.
+        
+        :param ordered: The failover order.
+        :return: An iterator over (service, slot) entries.
+        """
+        breaker = self.circuit_breaker
+        allow_request = breaker.allow_request
+        # Skip the open circuits in one pass before the per-service checks
+        allowed = breaker.allow_mask()
+        for entry in ordered:
+            service, slot = entry
+            if allowed[slot] and allow_request(service):
+                yield entry
+            else:
+                logger.debug("Request not allowed for service %s", service)
+
+    def _start_attempt(self, entry: Tuple[Service, int], endpoint: str, method: str,
+                       params: Optional[Dict], data: Optional[Dict]) -> asyncio.Task:
+        """
+        Run a request against one service, with retries, in a new task.
+        
+        :param entry: The (service, slot) entry of the service.
+        :param endpoint: The API endpoint to request.
+        :param method: The HTTP method to use.
+        :param params: The query parameters for the request.
+        :param data: The data to send in the request body.
+        :return: The task producing the response text and how long it may be cached.
+        """
+        return asyncio.get_running_loop().create_task(self._attempt(entry, endpoint, method, params, data))
+
+    async def _attempt(self, entry: Tuple[Service, int], endpoint: str, method: str,
+                       params: Optional[Dict], data: Optional[Dict]) -> Tuple[str, Optional[float]]:
+        """
+        Request one service with retries and record the outcome in the circuit breaker.
+
+        A cancelled attempt (the loser of a hedged race) is not counted as a failure. Requests
+        answered into the shared cache skip the service's own cache, so a response is never
+        kept by the service for longer than it may be cached.
+        
+        :param entry: The (service, slot) entry of the service.
+        :param endpoint: The API endpoint to request.
+        :param method: The HTTP method to use.
+        :param params: The query parameters for the request.
+        :param data: The data to send in the request body.
+        :return: The response text from the service and how long it may be cached.
+        """
+        service, slot = entry
+        started = time.monotonic()
+        try:
+            if self.cache is not None and method == 'GET':
+                result = await self.retry_policy.execute_with_retry(
+                    service.request_uncached, endpoint, method=method, params=params, data=data
+                )
+            else:
+                text = await self.retry_policy.execute_with_retry(service.request, endpoint, method=method, params=params, data=data)
+                result = (text, None)
+        except Exception as e:
+            self.circuit_breaker.record_failure(service)
+            logger.error("Service %s failed with error: %s.", service, e)
+            raise
+        if self.hedge_delay is not None:
+            latencies = self._latencies.get(slot)
+            if latencies is None:
+                latencies = self._latencies[slot] = deque(maxlen=HEDGE_LATENCY_WINDOW)
+            latencies.append(time.monotonic() - started)
+        self.circuit_breaker.record_success(service)
+        logger.info("Service %s responded successfully.", service)
+        return result
+
+    def _hedge_after(self, slot: int) -> float:
+        """
+        Return how long to wait for a service before hedging the request.
+        
+        :param slot: The circuit breaker slot of the service.
+        :return: The service's HEDGE_PERCENTILE latency once HEDGE_MIN_SAMPLES successes were
+            observed, hedge_delay until then.
+        """
+        latencies = self._latencies.get(slot)
+        if latencies is None or len(latencies) < HEDGE_MIN_SAMPLES:
+            return self.hedge_delay
+        ranked = sorted(latencies)
+        return ranked[int(HEDGE_PERCENTILE * (len(ranked) - 1))]
+
+    def _promote(self, entry: Tuple[Service, int]):
+        """
+        Move a service that just succeeded to the front of the failover order.
+
+        The other services keep their relative order, so the next requests go straight to a
+        service known to work instead of retrying the ones that failed before it.
+        
+        :param entry: The (service, slot) entry of the service.
+        """
+        ordered = self._ordered
+        if ordered[0] is not entry:
+            self._ordered = (entry,) + tuple(other for other in ordered if other is not entry)
@@ -1,32 +1,60 @@
-from prometheus_client import Counter, Histogram, Gauge
+from prometheus_client import Counter, Histogram, Gauge, start_http_server
 import logging
-from typing import ClassVar, Dict, Optional, Protocol
+import threading
+from typing import Any, ClassVar, Dict, Optional, Protocol, Tuple
 
 logger = logging.getLogger(__name__)
 
+_metrics_server_started = False
+_instance_lock = threading.Lock()
+
+def start_metrics_server(port: int = 8000) -> bool:
+    """
+    Expose the Prometheus metrics over HTTP, once per process.
+
+    Later calls are no-ops, and a port that is already in use is logged instead of raised.
+
+    :param port: The port to serve the metrics on.
+    :return: True if the server is running, False if it could not be started.
+    """
+    global _metrics_server_started
+    if _metrics_server_started:
+        return True
+    try:
+        start_http_server(port)
+    except OSError as e:
+        logger.warning("Could not start metrics server on port %s: %s", port, e)
+        return False
+    _metrics_server_started = True
+    logger.info("Metrics server started on port %s", port)
+    return True
+
 class MetricsCollector:
     """
     A singleton class to collect and record various metrics for external services.
     """
+    __slots__ = ()
     _instance: ClassVar[Optional['MetricsCollector']] = None
-    _initialized: bool = False
-    _metrics: Dict = {}
+    _metrics: ClassVar[Dict] = {}
+    # Labelled children by (metric name, label values), so labels() only runs once per combination
+    _children: ClassVar[Dict[Tuple[str, Tuple[str, ...]], Any]] = {}
 
     def __new__(cls) -> 'MetricsCollector':
         """
         Singleton pattern to ensure only one instance of MetricsCollector exists.
-        """
-        if cls._instance is None:
-            cls._instance = super(MetricsCollector, cls).__new__(cls)
-        return cls._instance
 
-    def __init__(self):
-        """
-        Initialize the MetricsCollector and set up metrics.
-        """
-        if not self._initialized:
-            self._initialized = True
-            self._setup_metrics()
+        The metrics are set up under a lock, so threads racing to create the first
+        instance cannot register the Prometheus metrics twice.
+        """
+        instance = cls._instance
+        if instance is None:
+            with _instance_lock:
+                instance = cls._instance
+                if instance is None:
+                    instance = super(MetricsCollector, cls).__new__(cls)
+                    instance._setup_metrics()
+                    cls._instance = instance
+        return instance
 
     def _setup_metrics(self) -> None:
         """
@@ -82,7 +110,7 @@ class MetricsCollector:
             
             logger.info("Metrics initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize metrics: {str(e)}")
+            logger.error("Failed to initialize metrics: %s", e)
             raise
 
     @property
@@ -103,6 +131,20 @@ class MetricsCollector:
         """
         return self._metrics['latency_histogram']
 
+    def labelled(self, name: str, *label_values: str) -> Any:
+        """
+        Return the child of a metric for the given label values, creating it on first use.
+        
+        :param name: The metric name, e.g. 'request_counter'.
+        :param label_values: The label values, in the order the metric declares its labels.
+        :return: The labelled metric child (Counter, Histogram or Gauge).
+        """
+        key = (name, label_values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._metrics[name].labels(*label_values)
+        return child
+
     def record_health_check(self, is_healthy: bool, service_name: str = "unknown") -> None:
         """
         Record the result of a health check.
@@ -110,18 +152,9 @@ class MetricsCollector:
         :param is_healthy: Whether the service is healthy.
         :param service_name: The name of the service.
         """
-        try:
-            status = "healthy" if is_healthy else "unhealthy"
-            self._metrics['health_check_counter'].labels(
-                service=service_name,
-                status=status
-            ).inc()
-            self._metrics['health_status'].labels(
-                service=service_name
-            ).set(1 if is_healthy else 0)
-            logger.info(f"Recorded health check for {service_name}: {status}")
-        except Exception as e:
-            logger.error(f"Failed to record health check metrics: {str(e)}")
+        status = "healthy" if is_healthy else "unhealthy"
+        self.labelled('health_check_counter', service_name, status).inc()
+        self.labelled('health_status', service_name).set(1 if is_healthy else 0)
 
     def record_error(self, error_type: str, message: str, service_name: str = "unknown") -> None:
         """
@@ -131,14 +164,8 @@ class MetricsCollector:
         :param message: The error message.
         :param service_name: The name of the service.
         """
-        try:
-            self._metrics['error_counter'].labels(
-                service=service_name,
-                error_type=error_type
-            ).inc()
-            logger.error(f"{error_type} error in {service_name}: {message}")
-        except Exception as e:
-            logger.error(f"Failed to record error metrics: {str(e)}")
+        self.labelled('error_counter', service_name, error_type).inc()
+        logger.error("%s error in %s: %s", error_type, service_name, message)
 
     def record_dns_latency(self, duration: float, service_name: str = "unknown") -> None:
         """
@@ -147,13 +174,7 @@ class MetricsCollector:
         :param duration: The DNS resolution time in seconds.
         :param service_name: The name of the service.
         """
-        try:
-            self._metrics['dns_latency'].labels(
-                service=service_name
-            ).observe(duration)
-            logger.info(f"Recorded DNS latency for {service_name}: {duration}s")
-        except Exception as e:
-            logger.error(f"Failed to record DNS latency metrics: {str(e)}")
+        self.labelled('dns_latency', service_name).observe(duration)
 
     def record_ping_latency(self, duration: float, service_name: str = "unknown") -> None:
         """
@@ -162,13 +183,7 @@ class MetricsCollector:
         :param duration: The ping latency in seconds.
         :param service_name: The name of the service.
         """
-        try:
-            self._metrics['ping_latency'].labels(
-                service=service_name
-            ).observe(duration)
-            logger.info(f"Recorded ping latency for {service_name}: {duration}s")
-        except Exception as e:
-            logger.error(f"Failed to record ping latency metrics: {str(e)}")
+        self.labelled('ping_latency', service_name).observe(duration)
 
     def record_request(self, endpoint: str, status: str, service_name: str = "unknown") -> None:
         """
@@ -178,12 +193,14 @@ class MetricsCollector:
         :param status: The status of the request.
         :param service_name: The name of the service.
         """
-        try:
-            self._metrics['request_counter'].labels(
-                service=service_name,
-                endpoint=endpoint,
-                status=status
-            ).inc()
-            logger.info(f"Recorded request to {endpoint} for {service_name} with status {status}")
-        except Exception as e:
-            logger.error(f"Failed to record request metrics: {str(e)}")
\ No newline at end of file
+        self.labelled('request_counter', service_name, endpoint, status).inc()
+
+def get_metrics() -> MetricsCollector:
+    """
+    Return the MetricsCollector shared by the whole process.
+
+    :return: The process-wide MetricsCollector.
+    """
+    return _metrics_collector
+
+_metrics_collector = MetricsCollector()
@@ -1,28 +1,63 @@
 import asyncio
 import random
 import logging
-import requests  # Add this import
-import configparser  # Add this import
-from typing import Callable
+import sys
+import time
+import warnings
+from typing import Callable, Tuple, Type
+
+from ._config import SETTINGS
 
 logger = logging.getLogger(__name__)
 
-config = configparser.ConfigParser()
-config.read('config.ini')
+DEFAULT_MAX_ATTEMPTS = SETTINGS.max_attempts
+DEFAULT_BASE_DELAY = SETTINGS.base_delay  # seconds
+DEFAULT_JITTER = SETTINGS.jitter  # seconds
+DEFAULT_MAX_DELAY = 30.0  # Upper bound of a single retry delay in seconds
+
+def _retryable_errors() -> Tuple[Type[BaseException], ...]:
+    """
+    Return the exception types that trigger a retry.
+
+    requests is not imported for this: a requests exception can only be raised once the
+    caller has imported requests itself, so its RequestException is looked up in sys.modules.
+    
+    :return: The retryable exception types.
+    """
+    requests = sys.modules.get('requests')
+    if requests is None:
+        return (ConnectionError,)
+    return (ConnectionError, requests.exceptions.RequestException)
 
 class RetryPolicy:
-    def __init__(self, max_attempts: int = None, base_delay: float = None, jitter: float = None):
+    def __init__(self, max_attempts: int = None, base_delay: float = None, jitter: float = None,
+                 max_delay: float = DEFAULT_MAX_DELAY):
         """
         Initialize the RetryPolicy with maximum attempts, base delay, and jitter.
+
+        Retries are spaced with full jitter: the delay before retry n is drawn uniformly between zero
+        and base_delay * 2**(n-1), capped at max_delay, so that clients failing together do not retry
+        together.
         
         :param max_attempts: The maximum number of retry attempts.
         :param base_delay: The base delay between retries.
-        :param jitter: The jitter to add randomness to the delay.
+        :param jitter: Deprecated and ignored: full jitter already randomizes the whole delay.
+            Passing it emits a DeprecationWarning.
+        :param max_delay: The maximum delay between two retries.
         """
-        self.max_attempts = max_attempts or config.getint('DEFAULT', 'MAX_ATTEMPTS', fallback=3)
-        self.base_delay = base_delay or config.getfloat('DEFAULT', 'BASE_DELAY', fallback=1.0)
-        self.jitter = jitter or config.getfloat('DEFAULT', 'JITTER', fallback=0.5)
-        logger.info(f"RetryPolicy initialized with max_attempts={self.max_attempts}, base_delay={self.base_delay}, jitter={self.jitter}")
+        self.max_attempts = max_attempts or DEFAULT_MAX_ATTEMPTS
+        self.base_delay = base_delay or DEFAULT_BASE_DELAY
+        if jitter is not None:
+            warnings.warn("RetryPolicy's jitter argument is ignored and will be removed; "
+                          "retries already use full jitter", DeprecationWarning, stacklevel=2)
+        # Kept for code reading it; retries do not use it
+        self.jitter = jitter or DEFAULT_JITTER
+        self.max_delay = max_delay
+        # Own generator, so concurrent retry storms do not all draw from the module-level one
+        self._rng = random.Random()
+        # Upper bound of the delay before each retry, computed once instead of on every failure
+        self._backoffs = tuple(min(max_delay, self.base_delay * (1 << i)) for i in range(self.max_attempts - 1))
+        logger.info("RetryPolicy initialized with max_attempts=%s, base_delay=%s, max_delay=%s", self.max_attempts, self.base_delay, self.max_delay)
 
     async def execute_with_retry(self, func: Callable, *args, **kwargs):
         """
@@ -30,15 +65,24 @@ class RetryPolicy:
         
         :param func: The function to execute.
         :return: The result of the function execution.
-        :raises Exception: If the maximum retry attempts are reached.
+        :raises ConnectionError: The error of the last attempt, if every attempt failed.
+        :raises requests.exceptions.RequestException: The error of the last attempt, if every attempt failed.
         """
-        for attempt in range(self.max_attempts):
+        attempt = 1
+        started = time.monotonic()
+        # Resolved once per call, and only when the attempts are actually logged
+        func_name = getattr(func, '__name__', func) if logger.isEnabledFor(logging.DEBUG) else None
+        while True:
             try:
-                logger.debug(f"Attempt {attempt + 1} for function {func.__name__}")
+                if func_name is not None:
+                    logger.debug("Attempt %s for function %s", attempt, func_name)
                 return await func(*args, **kwargs)
-            except (ConnectionError, requests.exceptions.RequestException) as e:
-                delay = self.base_delay * (2 ** attempt) + random.uniform(0, self.jitter)
-                logger.warning(f"Attempt {attempt + 1} failed with error: {e}. Retrying in {delay:.2f} seconds.")
-                await asyncio.sleep(delay)
-        logger.error("Max retry attempts reached.")
-        raise Exception("Max retry attempts reached.")
+            # Only evaluated once an exception was raised
+            except _retryable_errors() as e:
+                if attempt >= self.max_attempts:
+                    logger.error("Max retry attempts reached after %.2f seconds.", time.monotonic() - started)
+                    raise
+                delay = self._rng.random() * self._backoffs[attempt - 1]
+                logger.warning("Attempt %s failed with error: %s. Retrying in %.2f seconds.", attempt, e, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -1,10 +1,12 @@
-from asyncio_throttle import Throttler
+import asyncio
 import logging
-import configparser
+import weakref
+from typing import ClassVar, Hashable, Optional, Tuple
 
-# Load configuration from config file
-config = configparser.ConfigParser()
-config.read('config.ini')
+from ._config import SETTINGS
+
+DEFAULT_RATE_LIMIT = SETTINGS.rate_limit
+DEFAULT_RATE_LIMIT_PERIOD = SETTINGS.rate_limit_period  # seconds
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -12,8 +14,10 @@ logger = logging.getLogger(__name__)
 class RateLimiter:
     """
     RateLimiter class to control the rate of requests.
-    Uses asyncio_throttle.Throttler to manage the rate limiting.
+    Token bucket refilled continuously at rate/period tokens per second, holding at most rate tokens.
     """
+    # Limiters handed out by shared(), kept only while something still uses them
+    _shared: ClassVar['weakref.WeakValueDictionary[Tuple[Hashable, int, float], RateLimiter]'] = weakref.WeakValueDictionary()
 
     def __init__(self, rate: int = None, period: float = None):
         """
@@ -23,23 +27,71 @@ class RateLimiter:
         :param rate: Number of requests allowed per period.
         :param period: Time period in seconds for the rate limit.
         """
-        rate = rate or config.getint('DEFAULT', 'RATE_LIMIT', fallback=5)
-        period = period or config.getfloat('DEFAULT', 'RATE_LIMIT_PERIOD', fallback=1.0)
-        logger.debug(f"Initializing RateLimiter with rate={rate}, period={period}")
-        self.throttler = Throttler(rate, period)
+        rate = rate or DEFAULT_RATE_LIMIT
+        period = period or DEFAULT_RATE_LIMIT_PERIOD
+        logger.debug("Initializing RateLimiter with rate=%s, period=%s", rate, period)
+        self.capacity = float(rate)
+        self.fill_rate = rate / period  # tokens per second
+        self._tokens = self.capacity
+        self._updated_at: Optional[float] = None
+
+    @classmethod
+    def shared(cls, key: Hashable, rate: int = None, period: float = None) -> 'RateLimiter':
+        """
+        Return the RateLimiter shared by every caller using the same key, rate and period.
+
+        Callers limiting the same upstream, e.g. several services on one host, draw from a
+        single bucket, so the limit holds for the process rather than for each caller.
+
+        :param key: Identifies what is being limited, such as the origin of an API.
+        :param rate: Number of requests allowed per period.
+        :param period: Time period in seconds for the rate limit.
+        :return: The shared RateLimiter.
+        """
+        registry_key = (key, rate or DEFAULT_RATE_LIMIT, period or DEFAULT_RATE_LIMIT_PERIOD)
+        limiter = cls._shared.get(registry_key)
+        if limiter is None:
+            limiter = cls._shared[registry_key] = cls(rate, period)
+        return limiter
+
+    def _refill(self, now: float) -> None:
+        """
+        Add the tokens accumulated since the last refill.
+
+        :param now: The current event loop time.
+        """
+        if self._updated_at is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.fill_rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """
+        Wait until a token is available and take it.
+
+        The bookkeeping never awaits, so it runs atomically on the event loop without a lock;
+        waiting callers sleep independently, and one sleeper does not hold up callers that
+        could be served by tokens refilled meanwhile.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            self._refill(loop.time())
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self._tokens) / self.fill_rate)
 
     async def __aenter__(self):
         """
         Enter the asynchronous context manager.
         Acquires the rate limiter before making a request.
         """
-        logger.debug("Acquiring rate limiter")
-        await self.throttler.acquire()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Acquiring rate limiter")
+        await self.acquire()
 
     async def __aexit__(self, exc_type, exc, tb):
         """
         Exit the asynchronous context manager.
-        Releases the rate limiter after making a request.
+        Tokens are consumed, not returned, so there is nothing to release.
         """
-        logger.debug("Releasing rate limiter")
         pass
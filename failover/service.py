@@ -1,16 +1,17 @@
 from abc import ABC, abstractmethod
-import aioping
 import socket
 import asyncio
-from typing import Optional, Tuple, Dict, Any, Protocol
+import time
+from typing import Optional, Tuple, Dict, Any, Awaitable, Callable, ClassVar, Hashable, Protocol
 from urllib.parse import urlparse
 from datetime import datetime
 import logging
-import configparser
 
-# Load configuration from config file
-config = configparser.ConfigParser()
-config.read('config.ini')
+from ._config import SETTINGS
+
+DELAY_THRESHOLD = SETTINGS.delay_threshold  # seconds
+HEALTH_CHECK_TIMEOUT = SETTINGS.timeout  # seconds
+DNS_CACHE_TTL = SETTINGS.dns_cache_ttl  # seconds
 
 logger = logging.getLogger(__name__)
 
@@ -19,16 +20,23 @@ class MetricsCollectorProtocol(Protocol):
     def record_error(self, error_type: str, message: str) -> None: ...
 
 class CacheProtocol(Protocol):
-    def get(self, key: str) -> Any: ...
-    def set(self, key: str, value: Any) -> None: ...
+    def get(self, key: Hashable) -> Any: ...
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None: ...
+    async def get_or_compute(self, key: Hashable, coro_factory: Callable[[], Awaitable[Any]],
+                             with_ttl: bool = False) -> Any: ...
 
 class ConnectionPoolProtocol(Protocol):
     async def __aenter__(self) -> None: ...
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...
 
 class HealthStatus:
+    # One instance per health check, up to 100 kept per service in its history
+    __slots__ = ('timestamp', 'checked_at', 'dns_check', 'ping_check', 'overall_status', 'error_message')
+
     def __init__(self):
         self.timestamp = datetime.now()
+        # Monotonic time of the check, for age comparisons immune to wall-clock changes
+        self.checked_at = time.monotonic()
         self.dns_check = {"status": False, "message": "", "duration": 0}
         self.ping_check = {"status": False, "message": "", "duration": 0}
         self.overall_status = False
@@ -43,7 +51,16 @@ class HealthStatus:
             "error_message": self.error_message
         }
 
-    def __str__(self) -> str:
+    def __repr__(self) -> str:
+        return (f"HealthStatus(overall_status={self.overall_status}, "
+                f"dns={self.dns_check['status']}, ping={self.ping_check['status']})")
+
+    def format_report(self) -> str:
+        """
+        Render the status as a boxed, human-readable report.
+
+        :return: The multi-line report.
+        """
         status_symbol = "✅" if self.overall_status else "❌"
         return f"""
 ╔════════════════════ Health Check Report ════════════════════╗
@@ -78,15 +95,21 @@ class Service(ABC):
         cache (CacheProtocol): An instance of Cache for caching data.
         connection_pool (ConnectionPoolProtocol): An instance of ConnectionPool for managing connections.
         _last_health_status (Optional[HealthStatus]): The last recorded health status of the service.
-        delay_threshold (float): The threshold for acceptable delay in ping responses.
-        timeout (float): The maximum time to wait for DNS resolution and ping responses.
+        delay_threshold (float): The threshold for acceptable delay in connection probes.
+        timeout (float): The maximum time to wait for DNS resolution and connection probes.
+        dns_cache_ttl (float): How long, in seconds, a resolved address is reused by health checks.
 
     Methods:
         request(endpoint: str, method: str = 'GET', params: Dict = None, data: Dict = None) -> str:
             Abstract method to perform a request to the service.
-        health_check(timeout: float = None) -> HealthStatus:
+        request_uncached(endpoint: str, method: str = 'GET', params: Dict = None, data: Dict = None) -> Tuple[str, Optional[float]]:
+            Perform a request without the service's cache and return how long the response may be cached.
+        health_check(timeout: float = None, max_age: float = None) -> HealthStatus:
             Perform a comprehensive health check that verifies DNS resolution and network connectivity.
     """
+    # Resolved address and expiry time by hostname, shared by every service of the process
+    _dns_cache: ClassVar[Dict[str, Tuple[str, float]]] = {}
+
     def __init__(self, base_url: str):
         """
         Initialize the Service with a base URL.
@@ -94,22 +117,27 @@ class Service(ABC):
         :param base_url: The base URL of the service.
         """
         self.base_url = base_url
+        # base_url never changes, so health checks reuse the parsed host and port
+        parsed_url = urlparse(base_url)
+        self._hostname: Optional[str] = parsed_url.hostname
+        self._port: int = parsed_url.port or (80 if parsed_url.scheme == 'http' else 443)
         self.metrics: MetricsCollectorProtocol = self._create_metrics_collector()
         self.cache: CacheProtocol = self._create_cache()
         self.connection_pool: ConnectionPoolProtocol = self._create_connection_pool()
         self._last_health_status: Optional[HealthStatus] = None
-        self.delay_threshold = config.getfloat('DEFAULT', 'DELAY_THRESHOLD', fallback=1.0)
-        self.timeout = config.getfloat('DEFAULT', 'TIMEOUT', fallback=5.0)
-        logger.info(f"Service initialized with base_url={base_url}")
+        self.delay_threshold = DELAY_THRESHOLD
+        self.timeout = HEALTH_CHECK_TIMEOUT
+        self.dns_cache_ttl = DNS_CACHE_TTL
+        logger.info("Service initialized with base_url=%s", base_url)
 
     def _create_metrics_collector(self) -> MetricsCollectorProtocol:
         """
-        Create and return a MetricsCollector instance.
+        Return the MetricsCollector shared by the process.
         
-        :return: An instance of MetricsCollector.
+        :return: The process-wide MetricsCollector.
         """
-        from .metrics import MetricsCollector
-        return MetricsCollector()
+        from .metrics import get_metrics
+        return get_metrics()
 
     def _create_cache(self) -> CacheProtocol:
         """
@@ -142,98 +170,143 @@ class Service(ABC):
         """
         pass
 
-    async def _check_dns(self, hostname: str, timeout: float = None) -> Tuple[bool, Optional[str], float]:
+    async def request_uncached(self, endpoint: str, method: str = 'GET', params: Dict = None,
+                               data: Dict = None) -> Tuple[str, Optional[float]]:
+        """
+        Perform a request to the service without its own cache, for callers caching responses themselves.
+
+        Services that know how long their responses may be cached override this; the default
+        goes through request() and leaves the lifetime to the caller's cache.
+        
+        :param endpoint: The API endpoint to request.
+        :param method: The HTTP method to use (GET, POST, PUT, DELETE). Default is 'GET'.
+        :param params: The query parameters for the request. Default is None.
+        :param data: The data to send in the request body. Default is None.
+        :return: The response text and how long it may be cached in seconds, 0 if it must not be
+            cached, or None to use the cache default.
+        """
+        return await self.request(endpoint, method, params, data), None
+
+    async def _check_dns(self, hostname: str, timeout: float = None, port: int = 443) -> Tuple[bool, Optional[str], float]:
         """
         Check if DNS resolution works for the given hostname.
+
+        A successful resolution is cached for dns_cache_ttl seconds and shared with the other
+        services of the same host; while it is fresh the check succeeds immediately with a
+        duration of 0.
         
         :param hostname: The hostname to resolve.
         :param timeout: The maximum time to wait for DNS resolution. Default is None.
+        :param port: The port the resolved address will be probed on.
         :return: A tuple containing success status, error message, and duration.
         """
         timeout = timeout or self.timeout
-        logger.debug(f"Checking DNS for hostname={hostname}")
-        start_time = asyncio.get_event_loop().time()
+        cached = self._dns_cache.get(hostname)
+        if cached is not None and time.monotonic() < cached[1]:
+            logger.debug("Using cached DNS resolution for hostname=%s", hostname)
+            return True, None, 0.0
+        logger.debug("Checking DNS for hostname=%s", hostname)
+        start_time = time.monotonic()
         try:
-            await asyncio.get_event_loop().getaddrinfo(hostname, None)
-            duration = asyncio.get_event_loop().time() - start_time
-            return True, None, duration
+            # The resolver thread cannot be interrupted, but the check stops waiting for it
+            infos = await asyncio.wait_for(
+                asyncio.get_running_loop().getaddrinfo(hostname, port, type=socket.SOCK_STREAM),
+                timeout=timeout
+            )
         except socket.gaierror as e:
-            duration = asyncio.get_event_loop().time() - start_time
-            return False, f"DNS resolution failed: {str(e)}", duration
+            error = f"DNS resolution failed: {str(e)}"
         except asyncio.TimeoutError:
-            duration = asyncio.get_event_loop().time() - start_time
-            return False, "DNS resolution timed out", duration
-        except Exception as e:
-            duration = asyncio.get_event_loop().time() - start_time
-            return False, f"Unexpected error during DNS resolution: {str(e)}", duration
+            error = "DNS resolution timed out"
+        except (OSError, ValueError) as e:
+            # Other socket errors, or a hostname that cannot be encoded
+            error = f"Unexpected error during DNS resolution: {str(e)}"
+        else:
+            resolved_at = time.monotonic()
+            self._dns_cache[hostname] = (infos[0][4][0], resolved_at + self.dns_cache_ttl)
+            return True, None, resolved_at - start_time
+        return False, error, time.monotonic() - start_time
 
-    async def _check_ping(self, hostname: str, timeout: float = None) -> Tuple[bool, Optional[str], float]:
+    async def _check_ping(self, hostname: str, timeout: float = None, port: int = 443) -> Tuple[bool, Optional[str], float]:
         """
-        Check if host responds to ping within acceptable delay.
+        Check if the host accepts a TCP connection within acceptable delay.
+
+        This replaces an ICMP ping: it needs no raw-socket privileges, goes through the same
+        port as real requests, and connects to the cached address when one is available.
         
-        :param hostname: The hostname to ping.
-        :param timeout: The maximum time to wait for ping response. Default is None.
+        :param hostname: The hostname to probe.
+        :param timeout: The maximum time to wait for the connection. Default is None.
+        :param port: The TCP port to connect to.
         :return: A tuple containing success status, error message, and duration.
         """
         timeout = timeout or self.timeout
-        logger.debug(f"Checking ping for hostname={hostname}")
-        start_time = asyncio.get_event_loop().time()
+        cached = self._dns_cache.get(hostname)
+        address = cached[0] if cached is not None else hostname
+        logger.debug("Checking connectivity for hostname=%s address=%s port=%s", hostname, address, port)
+        start_time = time.monotonic()
         try:
-            delay = await asyncio.wait_for(aioping.ping(hostname), timeout=timeout)
-            duration = asyncio.get_event_loop().time() - start_time
-            if delay >= self.delay_threshold:
-                return False, f"High latency detected: {delay:.2f}s", duration
-            return True, None, duration
+            _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), timeout=timeout)
         except asyncio.TimeoutError:
-            duration = asyncio.get_event_loop().time() - start_time
-            return False, "Ping timed out", duration
+            self._dns_cache.pop(hostname, None)
+            error = "Connection probe timed out"
         except OSError as e:
-            duration = asyncio.get_event_loop().time() - start_time
-            return False, f"Network error during ping: {str(e)}", duration
-        except Exception as e:
-            duration = asyncio.get_event_loop().time() - start_time
-            return False, f"Unexpected error during ping: {str(e)}", duration
+            # The cached address may be stale; resolve again on the next check
+            self._dns_cache.pop(hostname, None)
+            error = f"Network error during connection probe: {str(e)}"
+        except ValueError as e:
+            # A hostname or address that cannot be encoded
+            error = f"Unexpected error during connection probe: {str(e)}"
+        else:
+            duration = time.monotonic() - start_time
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+            if duration >= self.delay_threshold:
+                return False, f"High latency detected: {duration:.2f}s", duration
+            return True, None, duration
+        return False, error, time.monotonic() - start_time
 
-    async def health_check(self, timeout: float = None) -> HealthStatus:
+    async def health_check(self, timeout: float = None, max_age: float = None) -> HealthStatus:
         """
         Comprehensive health check that verifies DNS resolution and network connectivity.
         
         :param timeout: Maximum time in seconds to wait for health check. Default is None.
+        :param max_age: If set, return the last status without checking again when it was healthy
+            and is younger than this many seconds. Default is None, which always checks.
         :return: A HealthStatus object containing detailed check results.
         """
+        last_status = self._last_health_status
+        if (max_age is not None and last_status is not None and last_status.overall_status
+                and time.monotonic() - last_status.checked_at < max_age):
+            return last_status
         timeout = timeout or self.timeout
-        logger.info(f"Performing health check for service with base_url={self.base_url}")
+        logger.info("Performing health check for service with base_url=%s", self.base_url)
         health_status = HealthStatus()
         
-        try:
-            parsed_url = urlparse(self.base_url)
-            hostname = parsed_url.hostname
-            
-            if not hostname:
-                health_status.error_message = "Invalid URL format: missing hostname"
-                return health_status
-
-            # Check DNS
-            dns_ok, dns_error, dns_duration = await self._check_dns(hostname, timeout)
-            health_status.dns_check = {
-                "status": dns_ok,
-                "message": dns_error if not dns_ok else "",
-                "duration": dns_duration
-            }
+        hostname = self._hostname
+        if not hostname:
+            health_status.error_message = "Invalid URL format: missing hostname"
+            return health_status
+        port = self._port
 
-            # Check ping if DNS is successful
-            if dns_ok:
-                ping_ok, ping_error, ping_duration = await self._check_ping(hostname, timeout)
-                health_status.ping_check = {
-                    "status": ping_ok,
-                    "message": ping_error if not ping_ok else "",
-                    "duration": ping_duration
-                }
-            
-            health_status.overall_status = dns_ok and (not dns_ok or health_status.ping_check["status"])
-
-        except Exception as e:
-            health_status.error_message = f"Health check failed: {str(e)}"
+        # DNS and connectivity are checked concurrently; the probe is only trusted if DNS works
+        (dns_ok, dns_error, dns_duration), (ping_ok, ping_error, ping_duration) = await asyncio.gather(
+            self._check_dns(hostname, timeout, port),
+            self._check_ping(hostname, timeout, port)
+        )
+        health_status.dns_check = {
+            "status": dns_ok,
+            "message": dns_error if not dns_ok else "",
+            "duration": dns_duration
+        }
+        if dns_ok:
+            health_status.ping_check = {
+                "status": ping_ok,
+                "message": ping_error if not ping_ok else "",
+                "duration": ping_duration
+            }
+        health_status.overall_status = dns_ok and ping_ok
 
         self._last_health_status = health_status
         return health_status
@@ -2,7 +2,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
+from .exceptions import AllServicesFailedError
 from .service import Service
 
 class ServiceHandler:
@@ -16,7 +17,7 @@ class ServiceHandler:
         :param service: The service to handle requests for.
         :param next_handler: The next handler to pass the request to if the current service fails.
         """
-        logger.debug(f"Initializing ServiceHandler for service {service}")
+        logger.debug("Initializing ServiceHandler for service %s", service)
         self.service = service
         self.next_handler = next_handler
 
@@ -29,28 +30,32 @@ class ServiceHandler:
         :param params: The query parameters for the request. Default is None.
         :param data: The data to send in the request body. Default is None.
         :return: The response text from the service.
-        :raises Exception: If all services fail.
+        :raises AllServicesFailedError: If all services fail.
         """
-        logger.debug(f"Handling request for endpoint {endpoint} with method {method}")
-        if not self.service.circuit_breaker.allow_request(self.service):
-            logger.debug(f"Circuit breaker does not allow request for service {self.service}")
-            if self.next_handler:
-                logger.debug("Passing request to next handler")
-                return await self.next_handler.handle(endpoint, method, params, data)
-            else:
-                logger.error("All services failed.")
-                raise Exception("All services failed.")
-        try:
-            result = await self.service.retry_policy.execute_with_retry(self.service.request, endpoint, method=method, params=params, data=data)
-            self.service.circuit_breaker.record_success(self.service)
-            logger.info(f"Service {self.service} responded successfully.")
-            return result
-        except Exception as e:
-            self.service.circuit_breaker.record_failure(self.service)
-            logger.error(f"Service {self.service} failed with error: {e}.")
-            if self.next_handler:
-                logger.debug("Passing request to next handler after failure")
-                return await self.next_handler.handle(endpoint, method, params, data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Handling request for endpoint %s with method %s", endpoint, method)
+        # The chain is walked in a loop rather than by recursion, so a request falling through
+        # N handlers does not stack N coroutines
+        handler = self
+        failures: List[Tuple[Service, BaseException]] = []
+        while handler is not None:
+            service = handler.service
+            if not service.circuit_breaker.allow_request(service):
+                logger.debug("Circuit breaker does not allow request for service %s", service)
             else:
-                logger.error("All services failed.")
-                raise Exception("All services failed.")
\ No newline at end of file
+                try:
+                    result = await service.retry_policy.execute_with_retry(service.request, endpoint, method=method, params=params, data=data)
+                    service.circuit_breaker.record_success(service)
+                    logger.info("Service %s responded successfully.", service)
+                    return result
+                except Exception as e:
+                    service.circuit_breaker.record_failure(service)
+                    logger.error("Service %s failed with error: %s.", service, e)
+                    failures.append((service, e))
+            handler = handler.next_handler
+            if handler is not None:
+                logger.debug("Passing request to next handler")
+        logger.error("All services failed.")
+        if failures:
+            raise AllServicesFailedError(failures) from failures[-1][1]
+        raise AllServicesFailedError()
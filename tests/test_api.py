@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from aiohttp import web
+
+from failover.api import APIService
+from failover.exceptions import RateLimitExceededError
+from failover.policies import RetryPolicy
+from failover.rate import RateLimiter
+
+
+class BuildUrlTest(unittest.TestCase):
+    def assert_joined(self, base_url: str, endpoint: str) -> None:
+        service = APIService('key', base_url)
+        self.assertEqual(str(service._build_url(endpoint)), base_url + endpoint)
+
+    def test_keeps_percent_escapes(self):
+        self.assert_joined('http://127.0.0.1/api', '/files/a%2Fb?name=%26x')
+
+    def test_keeps_query_of_base_url(self):
+        self.assert_joined('http://127.0.0.1/api?key=1', '&page=2')
+
+    def test_keeps_trailing_slash(self):
+        self.assert_joined('http://127.0.0.1/api', '/')
+        self.assert_joined('http://127.0.0.1/api/', 'users/')
+
+    def test_reuses_url_of_endpoint(self):
+        service = APIService('key', 'http://127.0.0.1/api')
+        self.assertIs(service._build_url('/users'), service._build_url('/users'))
+
+
+class RequestTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async def echo(request):
+            return web.Response(text=f"{request.method} {await request.text()}")
+
+        app = web.Application()
+        app.router.add_route('*', '/items', echo)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.service = APIService('key', f"http://127.0.0.1:{port}")
+
+    async def asyncTearDown(self):
+        await self.service.close()
+        await self.runner.cleanup()
+
+    async def test_patch_sends_json_body(self):
+        self.assertEqual(await self.service.request('/items', method='PATCH', data={'a': 1}), 'PATCH {"a": 1}')
+
+    async def test_rejects_unknown_method(self):
+        with self.assertRaises(ValueError):
+            await self.service.request('/items', method='TRACE')
+
+
+class RateLimitedTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.rejected = 0
+        self.reject_first = 0
+        self.arrivals = []
+
+        async def limited(request):
+            if self.rejected < self.reject_first:
+                self.rejected += 1
+                return web.Response(status=429, headers={'Retry-After': request.query['retry_after']})
+            self.arrivals.append(asyncio.get_running_loop().time())
+            return web.Response(text='ok')
+
+        app = web.Application()
+        app.router.add_get('/limited', limited)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.service = APIService('key', f"http://127.0.0.1:{port}")
+        # Let every request through at once, so only the 429 backoff spaces them
+        self.service.rate_limiter = RateLimiter(1000, 1.0)
+
+    async def asyncTearDown(self):
+        await self.service.close()
+        await self.runner.cleanup()
+
+    async def test_concurrent_retries_are_spread_out(self):
+        callers = 10
+        self.reject_first = callers
+        started = asyncio.get_running_loop().time()
+        with mock.patch('failover.api.BACKOFF_JITTER', 0.3):
+            results = await asyncio.gather(*(
+                self.service.request('/limited', params={'retry_after': '0.1', 'caller': str(i)})
+                for i in range(callers)
+            ))
+        self.assertEqual(results, ['ok'] * callers)
+        self.assertGreaterEqual(min(self.arrivals) - started, 0.1)
+        self.assertGreater(max(self.arrivals) - min(self.arrivals), 0.1)
+
+    async def test_new_requests_wait_for_the_deadline(self):
+        self.reject_first = 1
+        loop = asyncio.get_running_loop()
+        with mock.patch('failover.api.BACKOFF_JITTER', 0.0):
+            first = loop.create_task(self.service.request('/limited', params={'retry_after': '0.2'}))
+            while not self.rejected:
+                await asyncio.sleep(0.01)
+            rejected_at = loop.time()
+            self.assertEqual(await self.service.request('/limited', params={'retry_after': '0'}), 'ok')
+            self.assertEqual(await first, 'ok')
+        self.assertGreaterEqual(min(self.arrivals) - rejected_at, 0.15)
+
+    async def test_spent_retry_budget_is_not_retried_by_the_policy(self):
+        self.reject_first = 100
+        with mock.patch('failover.api.MAX_429_RETRIES', 1), mock.patch('failover.api.BACKOFF_JITTER', 0.0):
+            with self.assertRaises(RateLimitExceededError):
+                await RetryPolicy(max_attempts=3, base_delay=0.01).execute_with_retry(
+                    self.service.request, '/limited', params={'retry_after': '0'}
+                )
+        self.assertEqual(self.rejected, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import asyncio
+import unittest
+
+from aiohttp import web
+
+from failover.api import APIService
+from failover.cache import Cache
+from failover.circuit_breaker import CircuitBreaker
+from failover.manager import FailoverManager
+from failover.policies import RetryPolicy
+
+
+class SharedCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.hits = 0
+
+        async def handle(request):
+            self.hits += 1
+            return web.Response(text=f"v{self.hits}", headers={'Cache-Control': request.query['cc']})
+
+        app = web.Application()
+        app.router.add_get('/data', handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        self.manager = FailoverManager(RetryPolicy(), CircuitBreaker(), cache=Cache())
+        self.service = APIService('key', f"http://127.0.0.1:{port}")
+        self.manager.register_service(self.service)
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+        await self.runner.cleanup()
+
+    async def test_no_store_response_is_not_cached(self):
+        for expected in ('v1', 'v2', 'v3'):
+            self.assertEqual(await self.manager.execute('/data', params={'cc': 'no-store'}), expected)
+        self.assertIsNone(self.service.cache.get(self.service._cache_key('GET', '/data', {'cc': 'no-store'}, None)))
+
+    async def test_cacheable_response_is_reused(self):
+        self.assertEqual(await self.manager.execute('/data', params={'cc': 'max-age=60'}), 'v1')
+        self.assertEqual(await self.manager.execute('/data', params={'cc': 'max-age=60'}), 'v1')
+        self.assertEqual(self.hits, 1)
+
+
+class HealthCheckTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.runner = web.AppRunner(web.Application())
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        self.manager = FailoverManager(RetryPolicy(), CircuitBreaker())
+        self.service = APIService('key', f"http://127.0.0.1:{port}")
+        self.manager.register_service(self.service)
+        self.probes = 0
+        check_ping = self.service._check_ping
+
+        async def counting_check_ping(*args, **kwargs):
+            self.probes += 1
+            return await check_ping(*args, **kwargs)
+
+        self.service._check_ping = counting_check_ping
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+        await self.runner.cleanup()
+
+    async def test_fresh_healthy_status_is_reused(self):
+        self.assertTrue(await self.service.verify_service_health(display_results=False))
+        self.manager.start_health_checks(interval=60)
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.probes, 1)
+        self.assertEqual(len(self.service.health_history), 1)
+
+    async def test_stale_status_is_checked_again(self):
+        self.assertTrue(await self.service.verify_service_health(display_results=False))
+        self.manager.start_health_checks(interval=0.01)
+        await asyncio.sleep(0.05)
+        self.assertGreater(self.probes, 1)
+
+
+class HedgingTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = []
+        self.runners = []
+        self.manager = FailoverManager(RetryPolicy(), CircuitBreaker(), hedge_delay=0.05)
+        for name, delay in (('slow', 0.3), ('fast', 0.0)):
+            self.manager.register_service(APIService('key', await self._serve(name, delay)))
+
+    async def _serve(self, name: str, delay: float) -> str:
+        async def handle(request):
+            self.calls.append((name, request.method))
+            await asyncio.sleep(delay)
+            return web.Response(text=name)
+
+        app = web.Application()
+        app.router.add_route('*', '/items', handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        self.runners.append(runner)
+        return f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+        for runner in self.runners:
+            await runner.cleanup()
+
+    async def test_slow_get_is_hedged(self):
+        self.assertEqual(await self.manager.execute('/items'), 'fast')
+        self.assertEqual(self.calls, [('slow', 'GET'), ('fast', 'GET')])
+
+    async def test_slow_write_is_not_hedged(self):
+        for method in ('POST', 'PUT', 'PATCH', 'DELETE'):
+            self.calls.clear()
+            self.assertEqual(await self.manager.execute('/items', method=method, data={'a': 1}), 'slow')
+            self.assertEqual(self.calls, [('slow', method)])
+
+
+if __name__ == '__main__':
+    unittest.main()
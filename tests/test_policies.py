@@ -0,0 +1,17 @@
+import unittest
+
+from failover.policies import DEFAULT_JITTER, RetryPolicy
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_jitter_argument_is_deprecated(self):
+        with self.assertWarns(DeprecationWarning):
+            policy = RetryPolicy(jitter=0.2)
+        self.assertEqual(policy.jitter, 0.2)
+
+    def test_jitter_attribute_defaults(self):
+        self.assertEqual(RetryPolicy().jitter, DEFAULT_JITTER)
+
+
+if __name__ == '__main__':
+    unittest.main()